@@ -20,5 +20,30 @@ def get_neo4j_config():
     return {
         'uri': os.getenv('NEO4J_URI'),
         'user': os.getenv('NEO4J_USER', 'neo4j'),
-        'password': os.getenv('NEO4J_PASSWORD')
+        'password': os.getenv('NEO4J_PASSWORD'),
+        'database': os.getenv('NEO4J_DATABASE', 'neo4j'),
+        # Driver connection pool settings (timeouts/lifetime in seconds)
+        'max_connection_pool_size': int(os.getenv('NEO4J_MAX_POOL_SIZE', '100')),
+        'connection_acquisition_timeout': float(os.getenv('NEO4J_ACQUISITION_TIMEOUT', '60')),
+        'max_connection_lifetime': float(os.getenv('NEO4J_MAX_CONNECTION_LIFETIME', '1800')),
+        'connection_timeout': float(os.getenv('NEO4J_CONNECTION_TIMEOUT', '30')),
+        # In-process read query cache (ttl in seconds)
+        'cache_size': int(os.getenv('NEO4J_CACHE_SIZE', '2048')),
+        'cache_ttl': float(os.getenv('NEO4J_CACHE_TTL', '300'))
+    }
+
+
+def get_driver_options(config=None):
+    """
+    Returns the keyword arguments for GraphDatabase.driver() pool configuration.
+    """
+    config = config or get_neo4j_config()
+    return {
+        key: config[key]
+        for key in (
+            'max_connection_pool_size',
+            'connection_acquisition_timeout',
+            'max_connection_lifetime',
+            'connection_timeout'
+        )
     }
@@ -28,6 +28,13 @@ except Exception as e:
     warnings.warn(f"Failed to initialize graph client: {e}. Graph features will be unavailable.", RuntimeWarning)
     graph = None
 
+# Plan every query template once at startup so the first user query is not cold
+if graph:
+    try:
+        graph.warmup()
+    except Exception as e:
+        warnings.warn(f"Graph query warmup failed: {e}", RuntimeWarning)
+
 
 # -------------------------
 # SQL Access Functions
@@ -142,6 +149,17 @@ def get_related_papers_from_graph(entity_id):
         return []
 
 
+def get_related_papers_bulk_from_graph(entity_ids, limit=20):
+    """Get papers related to several entities in one graph query."""
+    if not graph:
+        return {}
+    try:
+        return graph.get_related_papers_bulk(entity_ids, limit)
+    except Exception as e:
+        warnings.warn(f"Failed to get related papers: {e}", RuntimeWarning)
+        return {}
+
+
 def get_entity_relations(entity_id, relation_type=None):
     """Get entity relations from knowledge graph."""
     if not graph:
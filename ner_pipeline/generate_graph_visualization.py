@@ -6,16 +6,156 @@ Creates a beautiful network view that can be embedded in the dashboard.
 
 import sys
 import os
+import json
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from pyvis.network import Network
 from nosql import GraphClient
 from pathlib import Path
+from collections import defaultdict
 
 # Output directory
 OUTPUT_DIR = Path(__file__).parent
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Styles and JavaScript for the entity details panel (reads the #entity-data JSON block)
+ENTITY_DETAILS_PANEL = """
+    <style>
+    #entity-details {
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        width: 350px;
+        max-height: 80vh;
+        overflow-y: auto;
+        background: rgba(30, 30, 30, 0.95);
+        border: 2px solid #4CAF50;
+        border-radius: 10px;
+        padding: 20px;
+        color: white;
+        font-family: Arial, sans-serif;
+        display: none;
+        z-index: 1000;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
+    }
+    #entity-details h3 {
+        margin: 0 0 10px 0;
+        color: #4CAF50;
+        font-size: 18px;
+    }
+    #entity-details .close-btn {
+        position: absolute;
+        top: 10px;
+        right: 10px;
+        background: #f44336;
+        color: white;
+        border: none;
+        border-radius: 50%;
+        width: 25px;
+        height: 25px;
+        cursor: pointer;
+        font-size: 16px;
+        line-height: 25px;
+        text-align: center;
+    }
+    #entity-details .metric {
+        margin: 10px 0;
+        padding: 8px;
+        background: rgba(255, 255, 255, 0.1);
+        border-radius: 5px;
+    }
+    #entity-details .metric-label {
+        color: #aaa;
+        font-size: 12px;
+    }
+    #entity-details .metric-value {
+        color: white;
+        font-size: 16px;
+        font-weight: bold;
+    }
+    #entity-details .relations {
+        margin-top: 15px;
+    }
+    #entity-details .relation-item {
+        margin: 8px 0;
+        padding: 8px;
+        background: rgba(255, 255, 255, 0.05);
+        border-left: 3px solid #2196F3;
+        border-radius: 3px;
+        font-size: 12px;
+    }
+    #entity-details .relation-type {
+        color: #4CAF50;
+        font-weight: bold;
+    }
+    </style>
+    
+    <div id="entity-details">
+        <button class="close-btn" onclick="document.getElementById('entity-details').style.display='none'">×</button>
+        <div id="details-content"></div>
+    </div>
+    
+    <script>
+    const entityData = JSON.parse(document.getElementById('entity-data').textContent);
+    
+    // Handle node clicks to show entity details
+    network.on("click", function(params) {
+        const detailsPanel = document.getElementById('entity-details');
+        const detailsContent = document.getElementById('details-content');
+        
+        if (params.nodes.length > 0) {
+            const nodeId = params.nodes[0];
+            const data = entityData[nodeId];
+            
+            if (data) {
+                let html = `
+                    <h3>${data.name}</h3>
+                    <div class="metric">
+                        <div class="metric-label">Type</div>
+                        <div class="metric-value">${data.type}</div>
+                    </div>
+                    <div class="metric">
+                        <div class="metric-label">Importance Score</div>
+                        <div class="metric-value">${data.importance.toFixed(1)}</div>
+                    </div>
+                    <div class="metric">
+                        <div class="metric-label">Papers</div>
+                        <div class="metric-value">${data.papers}</div>
+                    </div>
+                    <div class="metric">
+                        <div class="metric-label">Relations</div>
+                        <div class="metric-value">${data.relation_count}</div>
+                    </div>
+                `;
+                
+                if (data.relations && data.relations.length > 0) {
+                    html += '<div class="relations"><strong>Relationships:</strong>';
+                    data.relations.forEach(rel => {
+                        html += `
+                            <div class="relation-item">
+                                <strong>${rel.source}</strong> 
+                                <span class="relation-type">${rel.relation}</span> 
+                                <strong>${rel.target}</strong><br>
+                                <span style="color: #aaa; font-size: 11px;">
+                                    Evidence: ${rel.evidence} | Confidence: ${rel.confidence.toFixed(2)}
+                                </span>
+                            </div>
+                        `;
+                    });
+                    html += '</div>';
+                }
+                
+                detailsContent.innerHTML = html;
+                detailsPanel.style.display = 'block';
+            }
+        } else {
+            detailsPanel.style.display = 'none';
+        }
+    });
+    </script>
+    """
+
+
 def generate_graph_visualization(
     max_entities=50,
     output_file="knowledge_graph.html"
@@ -47,12 +187,14 @@ def generate_graph_visualization(
     # Fetch all relations between these entities
     print(f"\n🔗 Fetching relationships...")
     all_relations = []
-    for entity_id in entity_ids:
-        relations = graph.get_entity_relations(entity_id)
-        # Only keep relations where both source and target are in our entity set
-        filtered = [r for r in relations 
-                   if r['source_id'] in entity_ids and r['target_id'] in entity_ids]
-        all_relations.extend(filtered)
+    with graph.batch() as batch_graph:
+        for entity_id in entity_ids:
+            # Relation paper lists are not shown in the graph, so skip transferring them
+            relations = batch_graph.get_entity_relations(entity_id, paper_limit=0)
+            # Only keep relations where both source and target are in our entity set
+            filtered = [r for r in relations 
+                       if r['source_id'] in entity_ids and r['target_id'] in entity_ids]
+            all_relations.extend(filtered)
     
     # Deduplicate relations
     seen = set()
@@ -177,12 +319,18 @@ def generate_graph_visualization(
     with open(output_path, 'r', encoding='utf-8') as f:
         html_content = f.read()
     
+    # Index relations by endpoint in one pass
+    relations_by_entity = defaultdict(list)
+    for rel in unique_relations:
+        relations_by_entity[rel['source_id']].append(rel)
+        if rel['target_id'] != rel['source_id']:
+            relations_by_entity[rel['target_id']].append(rel)
+    
     # Create entity data map for JavaScript access
     entity_data = {}
     for entity_id, entity in entity_map.items():
         # Get relations for this entity
-        entity_relations = [r for r in unique_relations 
-                           if r['source_id'] == entity_id or r['target_id'] == entity_id]
+        entity_relations = relations_by_entity.get(entity_id, [])
         entity_data[entity_id] = {
             'name': entity['name'],
             'type': entity['type'],
@@ -201,148 +349,12 @@ def generate_graph_visualization(
             ]
         }
     
-    import json
-    entity_data_json = json.dumps(entity_data, indent=2)
-    
-    # Inject styles and JavaScript for entity details panel
-    click_handler_js = f"""
-    <style>
-    #entity-details {{
-        position: fixed;
-        top: 20px;
-        right: 20px;
-        width: 350px;
-        max-height: 80vh;
-        overflow-y: auto;
-        background: rgba(30, 30, 30, 0.95);
-        border: 2px solid #4CAF50;
-        border-radius: 10px;
-        padding: 20px;
-        color: white;
-        font-family: Arial, sans-serif;
-        display: none;
-        z-index: 1000;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-    }}
-    #entity-details h3 {{
-        margin: 0 0 10px 0;
-        color: #4CAF50;
-        font-size: 18px;
-    }}
-    #entity-details .close-btn {{
-        position: absolute;
-        top: 10px;
-        right: 10px;
-        background: #f44336;
-        color: white;
-        border: none;
-        border-radius: 50%;
-        width: 25px;
-        height: 25px;
-        cursor: pointer;
-        font-size: 16px;
-        line-height: 25px;
-        text-align: center;
-    }}
-    #entity-details .metric {{
-        margin: 10px 0;
-        padding: 8px;
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 5px;
-    }}
-    #entity-details .metric-label {{
-        color: #aaa;
-        font-size: 12px;
-    }}
-    #entity-details .metric-value {{
-        color: white;
-        font-size: 16px;
-        font-weight: bold;
-    }}
-    #entity-details .relations {{
-        margin-top: 15px;
-    }}
-    #entity-details .relation-item {{
-        margin: 8px 0;
-        padding: 8px;
-        background: rgba(255, 255, 255, 0.05);
-        border-left: 3px solid #2196F3;
-        border-radius: 3px;
-        font-size: 12px;
-    }}
-    #entity-details .relation-type {{
-        color: #4CAF50;
-        font-weight: bold;
-    }}
-    </style>
-    
-    <div id="entity-details">
-        <button class="close-btn" onclick="document.getElementById('entity-details').style.display='none'">×</button>
-        <div id="details-content"></div>
-    </div>
-    
-    <script>
-    const entityData = {entity_data_json};
-    
-    // Handle node clicks to show entity details
-    network.on("click", function(params) {{
-        const detailsPanel = document.getElementById('entity-details');
-        const detailsContent = document.getElementById('details-content');
-        
-        if (params.nodes.length > 0) {{
-            const nodeId = params.nodes[0];
-            const data = entityData[nodeId];
-            
-            if (data) {{
-                let html = `
-                    <h3>${{data.name}}</h3>
-                    <div class="metric">
-                        <div class="metric-label">Type</div>
-                        <div class="metric-value">${{data.type}}</div>
-                    </div>
-                    <div class="metric">
-                        <div class="metric-label">Importance Score</div>
-                        <div class="metric-value">${{data.importance.toFixed(1)}}</div>
-                    </div>
-                    <div class="metric">
-                        <div class="metric-label">Papers</div>
-                        <div class="metric-value">${{data.papers}}</div>
-                    </div>
-                    <div class="metric">
-                        <div class="metric-label">Relations</div>
-                        <div class="metric-value">${{data.relation_count}}</div>
-                    </div>
-                `;
-                
-                if (data.relations && data.relations.length > 0) {{
-                    html += '<div class="relations"><strong>Relationships:</strong>';
-                    data.relations.forEach(rel => {{
-                        html += `
-                            <div class="relation-item">
-                                <strong>${{rel.source}}</strong> 
-                                <span class="relation-type">${{rel.relation}}</span> 
-                                <strong>${{rel.target}}</strong><br>
-                                <span style="color: #aaa; font-size: 11px;">
-                                    Evidence: ${{rel.evidence}} | Confidence: ${{rel.confidence.toFixed(2)}}
-                                </span>
-                            </div>
-                        `;
-                    }});
-                    html += '</div>';
-                }}
-                
-                detailsContent.innerHTML = html;
-                detailsPanel.style.display = 'block';
-            }}
-        }} else {{
-            detailsPanel.style.display = 'none';
-        }}
-    }});
-    </script>
-    """
+    # Embed entity data as a JSON data block (parsed once by the browser with JSON.parse)
+    entity_data_json = json.dumps(entity_data, separators=(',', ':')).replace('</', '<\\/')
+    entity_data_script = f'<script id="entity-data" type="application/json">{entity_data_json}</script>'
     
     # Insert before closing body tag
-    html_content = html_content.replace('</body>', f'{click_handler_js}</body>')
+    html_content = html_content.replace('</body>', f'{entity_data_script}{ENTITY_DETAILS_PANEL}</body>')
     
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html_content)
@@ -8,38 +8,135 @@ Prerequisites:
 - Neo4j installed and running (or Neo4j Aura cloud instance)
 - neo4j Python driver installed (pip install neo4j)
 - Config updated in config/neo4j_config.py
+- ijson (optional) to stream the input JSON instead of loading it whole
 """
 
+import atexit
+import csv
 import json
+import statistics
+import subprocess
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
 from neo4j import GraphDatabase
 from tqdm import tqdm
 import sys
 
+try:
+    import ijson
+except ImportError:  # fall back to json.load
+    ijson = None
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from config.config import ROOT
-from config.neo4j_config import get_neo4j_config
+from config.neo4j_config import get_neo4j_config, get_driver_options
 
 # Paths
 GRAPH_DATA_DIR = ROOT / "graph_data"
 
+# Rows committed per server-side transaction (CALL { ... } IN TRANSACTIONS)
+BATCH_SIZE = 10000
+
+# Rows per UNWIND query are sized from the average encoded row so each request
+# carries roughly TARGET_BYTES_PER_BATCH, clamped to [MIN_BATCH_SIZE, MAX_BATCH_SIZE]
+TARGET_BYTES_PER_BATCH = 4 * 1024 * 1024
+MIN_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 20000
+BATCH_SAMPLE_ROWS = 10
+
+# Seconds to wait for new indexes/constraints to come online
+INDEX_ONLINE_TIMEOUT = 300
+
+# Characters not allowed in relationship type names, mapped to '_'
+_REL_TYPE_TRANS = str.maketrans({'-': '_', ' ': '_', '/': '_'})
+
+
+@lru_cache(maxsize=1)
+def _get_driver():
+    """Return the process-wide Neo4j driver (and its connection pool), creating it on first use."""
+    config = get_neo4j_config()
+    return GraphDatabase.driver(
+        config['uri'], auth=(config['user'], config['password']), **get_driver_options(config)
+    )
+
+
+@atexit.register
+def _close_driver():
+    """Close the shared driver at interpreter shutdown if it was ever created."""
+    if _get_driver.cache_info().currsize:
+        _get_driver().close()
+        _get_driver.cache_clear()
+
+
+def _chunked(iterable, size):
+    """Yield successive lists of up to `size` items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _adaptive_batch_size(sample_rows):
+    """Pick an UNWIND chunk size from the average JSON size of a few sample rows."""
+    if not sample_rows:
+        return MIN_BATCH_SIZE
+    avg_bytes = statistics.mean(len(json.dumps(row)) for row in sample_rows)
+    return max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, int(TARGET_BYTES_PER_BATCH // avg_bytes)))
+
+
+def _chunked_adaptive(iterable):
+    """Chunk an iterable (or stream) using a batch size sampled from its first rows."""
+    iterator = iter(iterable)
+    sample = list(islice(iterator, BATCH_SAMPLE_ROWS))
+    return _chunked(chain(sample, iterator), _adaptive_batch_size(sample))
+
+
+def _iter_json_array(path):
+    """
+    Yield the items of a top-level JSON array one at a time.
+    
+    Streams with ijson when installed so peak memory stays at one batch;
+    otherwise loads the file with json.load.
+    """
+    if ijson is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+    
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
 
 class Neo4jGraphBuilder:
     """Handles Neo4j graph construction."""
     
+    # (label, property) pairs that get a range index
+    INDEXES = [
+        ("Entity", "name"),
+        ("Entity", "type"),
+        ("Entity", "importance_score")
+    ]
+    
     def __init__(self):
         """Initialize Neo4j connection using config."""
         config = get_neo4j_config()
         uri = config['uri']
-        user = config['user']
-        password = config['password']
+        self.database = config.get('database', 'neo4j')
+        # Leave half the pool free for the main session and other clients
+        self.max_workers = max(1, config['max_connection_pool_size'] // 2)
         
         try:
-            self.driver = GraphDatabase.driver(uri, auth=(user, password))
+            self.driver = _get_driver()
+            # One session reused by every build step; naming the database skips home-db discovery
+            self.session = self.driver.session(database=self.database)
             # Test connection
-            with self.driver.session() as session:
-                session.run("RETURN 1")
+            self.session.run("RETURN 1").consume()
             print(f"✓ Connected to Neo4j at {uri}")
         except Exception as e:
             print(f"❌ Failed to connect to Neo4j: {e}")
@@ -51,163 +148,269 @@ class Neo4jGraphBuilder:
             raise
     
     def close(self):
-        """Close Neo4j connection."""
-        self.driver.close()
+        """Close the builder's session (the shared driver is closed at exit)."""
+        self.session.close()
     
     def clear_database(self):
         """Clear all nodes and relationships from database."""
         print("\n🗑️  Clearing existing graph data...")
-        with self.driver.session() as session:
-            # Delete all relationships first
-            session.run("MATCH ()-[r]->() DELETE r")
-            # Then delete all nodes
-            session.run("MATCH (n) DELETE n")
+        # Delete all relationships first
+        self.session.run("MATCH ()-[r]->() DELETE r")
+        # Then delete all nodes
+        self.session.run("MATCH (n) DELETE n")
         print("✓ Database cleared")
     
     def create_constraints(self):
-        """Create uniqueness constraints and indexes."""
+        """Create uniqueness constraints and indexes, then wait for them to come online."""
         print("\n📋 Creating constraints and indexes...")
         
-        with self.driver.session() as session:
-            # Constraint on entity_id (ensures uniqueness)
+        # Constraint on entity_id (ensures uniqueness)
+        try:
+            self.session.run(
+                "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS "
+                "FOR (e:Entity) REQUIRE e.entity_id IS UNIQUE"
+            )
+            print("✓ Created uniqueness constraint on Entity.entity_id")
+        except Exception as e:
+            print(f"  Note: Constraint may already exist ({e})")
+        
+        # Indexes for better query performance
+        for label, property in self.INDEXES:
             try:
-                session.run(
-                    "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS "
-                    "FOR (e:Entity) REQUIRE e.entity_id IS UNIQUE"
+                self.session.run(
+                    f"CREATE INDEX {label.lower()}_{property}_index IF NOT EXISTS "
+                    f"FOR (n:{label}) ON (n.{property})"
                 )
-                print("✓ Created uniqueness constraint on Entity.entity_id")
+                print(f"✓ Created index on {label}.{property}")
             except Exception as e:
-                print(f"  Note: Constraint may already exist ({e})")
-            
-            # Indexes for better query performance
-            indexes = [
-                ("Entity", "name"),
-                ("Entity", "type"),
-                ("Entity", "importance_score")
-            ]
-            
-            for label, property in indexes:
-                try:
-                    session.run(
-                        f"CREATE INDEX {label.lower()}_{property}_index IF NOT EXISTS "
-                        f"FOR (n:{label}) ON (n.{property})"
-                    )
-                    print(f"✓ Created index on {label}.{property}")
-                except Exception as e:
-                    print(f"  Note: Index may already exist ({e})")
-    
-    def create_entities(self, entities):
+                print(f"  Note: Index may already exist ({e})")
+        
+        # Wait for indexes to populate so relation MATCHes use index seeks, not label scans
+        self.session.run(f"CALL db.awaitIndexes({INDEX_ONLINE_TIMEOUT})").consume()
+        print("✓ Indexes online")
+    
+    def drop_constraints(self):
+        """Drop the entity constraint and indexes so a bulk load skips index maintenance."""
+        print("\n📋 Dropping constraints and indexes for bulk load...")
+        self.session.run("DROP CONSTRAINT entity_id_unique IF EXISTS").consume()
+        for label, property in self.INDEXES:
+            self.session.run(f"DROP INDEX {label.lower()}_{property}_index IF EXISTS").consume()
+        print("✓ Constraints and indexes dropped")
+    
+    def create_entities(self, entities, merge=True):
         """
-        Create Entity nodes in Neo4j.
+        Create (or update) Entity nodes in Neo4j, keyed on entity_id.
         
         Args:
-            entities: List of entity dictionaries
+            entities: Iterable of entity dictionaries (may be a stream)
+            merge: MERGE on entity_id (needs the constraint index). Use False to
+                   CREATE blindly when loading into an empty, unindexed database.
+        
+        Returns:
+            Number of entities written
         """
-        print(f"\n📊 Creating {len(entities)} entity nodes...")
+        print(f"\n📊 Creating entity nodes...")
         
-        with self.driver.session() as session:
-            for entity in tqdm(entities, desc="Creating entities"):
-                session.run(
-                    """
-                    CREATE (e:Entity {
-                        entity_id: $entity_id,
-                        name: $name,
-                        type: $type,
-                        papers: $papers,
-                        paper_count: $paper_count,
-                        importance_score: $importance_score,
-                        relation_count: $relation_count,
-                        synonyms: $synonyms
-                    })
-                    """,
-                    entity_id=entity['entity_id'],
-                    name=entity['name'],
-                    type=entity['type'],
-                    papers=entity['papers'],
-                    paper_count=len(entity['papers']),
-                    importance_score=entity.get('importance_score', 0),
-                    relation_count=entity.get('relation_count', 0),
-                    synonyms=entity.get('synonyms', [])
-                )
+        rows = (
+            {
+                'entity_id': entity['entity_id'],
+                'name': entity['name'],
+                'type': entity['type'],
+                'papers': entity['papers'],
+                'importance_score': entity.get('importance_score', 0),
+                'relation_count': entity.get('relation_count', 0),
+                'synonyms': entity.get('synonyms', [])
+            }
+            for entity in entities
+        )
+        
+        # The server splits each uploaded chunk into transactions of BATCH_SIZE rows.
+        # MERGE on the constrained entity_id is an index seek and keeps re-runs idempotent.
+        # paper_count is derived server-side so it is not shipped alongside papers.
+        if merge:
+            write = (
+                "MERGE (e:Entity {entity_id: row.entity_id}) "
+                "SET e += row, e.paper_count = size(row.papers)"
+            )
+        else:
+            write = "CREATE (e:Entity) SET e = row, e.paper_count = size(row.papers)"
+        query = (
+            f"UNWIND $rows AS row "
+            f"CALL {{ WITH row {write} }} IN TRANSACTIONS OF {BATCH_SIZE} ROWS"
+        )
+        
+        # Upload each chunk in the background while the next one is read and built,
+        # so input parsing overlaps the network round-trip (at most two chunks in memory)
+        entity_count = 0
+        pending = None
+        with ThreadPoolExecutor(max_workers=1) as uploader:
+            for batch in tqdm(_chunked_adaptive(rows), desc="Creating entity batches"):
+                if pending is not None:
+                    pending.result()
+                pending = uploader.submit(self.create_entities_batch, batch, query)
+                entity_count += len(batch)
+            if pending is not None:
+                pending.result()
+        
+        print(f"✓ Created {entity_count} entities")
+        return entity_count
+    
+    def create_entities_batch(self, batch, query):
+        """
+        Write one chunk of entity rows with a single UNWIND query.
         
-        print(f"✓ Created {len(entities)} entities")
+        CALL { ... } IN TRANSACTIONS has to run as an auto-commit query, so this
+        uses session.run rather than a managed transaction.
+        """
+        self.session.run(query, rows=batch).consume()
+    
+    @staticmethod
+    def _run_batch(tx, query, rows):
+        """Managed-transaction work unit: run one UNWIND batch and drain its result."""
+        tx.run(query, rows=rows).consume()
     
     def create_relations(self, relations):
         """
         Create relationship edges in Neo4j.
         
         Args:
-            relations: List of relation dictionaries
+            relations: Iterable of relation dictionaries (may be a stream)
+        
+        Returns:
+            Number of relations written
         """
-        print(f"\n🔗 Creating {len(relations)} relationships...")
+        print(f"\n🔗 Creating relationships...")
+        
+        # Relations are streamed into one buffer per relationship type and each
+        # buffer is handed to the writers as soon as it fills, so memory holds at
+        # most one partial batch per type plus the batches in flight.
+        # Neo4j relationship types must be uppercase and valid identifiers,
+        # so invalid characters are replaced while grouping.
+        queries = {}
+        buffers = defaultdict(list)
+        relation_count = 0
         
-        # Group relations by type for better performance
-        relations_by_type = {}
-        for rel in relations:
-            rel_type = rel['relation'].upper()
-            if rel_type not in relations_by_type:
-                relations_by_type[rel_type] = []
-            relations_by_type[rel_type].append(rel)
+        relations = iter(relations)
+        sample = list(islice(relations, BATCH_SAMPLE_ROWS))
+        batch_size = _adaptive_batch_size([self._relation_row(rel) for rel in sample])
         
-        with self.driver.session() as session:
-            for rel_type, rels in tqdm(relations_by_type.items(), desc="Creating relations"):
-                # Batch create relationships of same type
-                for rel in rels:
-                    # Neo4j relationship types must be uppercase and valid identifiers
-                    # Replace any invalid characters
-                    safe_rel_type = rel_type.replace('-', '_').replace(' ', '_')
-                    
-                    session.run(
-                        f"""
-                        MATCH (source:Entity {{entity_id: $source_id}})
-                        MATCH (target:Entity {{entity_id: $target_id}})
-                        CREATE (source)-[r:{safe_rel_type} {{
-                            relation_id: $relation_id,
-                            relation_type: $relation_type,
-                            papers: $papers,
-                            evidence_count: $evidence_count,
-                            confidence: $confidence
-                        }}]->(target)
-                        """,
-                        source_id=rel['source'],
-                        target_id=rel['target'],
-                        relation_id=rel['relation_id'],
-                        relation_type=rel['relation'],
-                        papers=rel['papers'],
-                        evidence_count=rel['evidence_count'],
-                        confidence=rel.get('confidence', 0.5)
-                    )
+        # Batches are independent, so write them concurrently over the driver's pool;
+        # submissions block once max_in_flight batches are queued or running
+        max_in_flight = 2 * self.max_workers
+        pending = set()
+        
+        def submit(query, batch):
+            nonlocal pending
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(self._write_relation_batch, (query, batch)))
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for rel in tqdm(chain(sample, relations), desc="Creating relations"):
+                relation_count += 1
+                safe_rel_type = rel['relation'].upper().translate(_REL_TYPE_TRANS)
+                if safe_rel_type not in queries:
+                    self._create_relation_index(safe_rel_type)
+                    queries[safe_rel_type] = self._relation_query(safe_rel_type)
+                
+                buffer = buffers[safe_rel_type]
+                buffer.append(self._relation_row(rel))
+                if len(buffer) >= batch_size:
+                    submit(queries[safe_rel_type], buffer)
+                    buffers[safe_rel_type] = []
+            
+            # Flush the partial batch left for each type
+            for safe_rel_type, buffer in buffers.items():
+                if buffer:
+                    submit(queries[safe_rel_type], buffer)
+            for future in pending:
+                future.result()
+        
+        print(f"✓ Created {relation_count} relationships")
+        return relation_count
+    
+    def _create_relation_index(self, safe_rel_type):
+        """Index relation_id on one relationship type and wait for it to come online."""
+        index_name = f"{safe_rel_type.lower()}_relation_id_index"
+        self.session.run(
+            f"CREATE INDEX `{index_name}` IF NOT EXISTS "
+            f"FOR ()-[r:`{safe_rel_type}`]-() ON (r.relation_id)"
+        ).consume()
+        self.session.run(
+            "CALL db.awaitIndex($name, $timeout)",
+            name=index_name, timeout=INDEX_ONLINE_TIMEOUT
+        ).consume()
+    
+    @staticmethod
+    def _relation_query(safe_rel_type):
+        """
+        UNWIND query writing one batch of relationships of a single type.
         
-        print(f"✓ Created {len(relations)} relationships")
+        MERGE on relation_id makes a batch idempotent: concurrent batches sharing
+        hub nodes can deadlock, and the driver's retry of such a transient error
+        (or of a commit whose outcome was lost) must not duplicate edges.
+        """
+        return f"""
+            UNWIND $rows AS row
+            MATCH (source:Entity {{entity_id: row.source_id}})
+            MATCH (target:Entity {{entity_id: row.target_id}})
+            MERGE (source)-[r:`{safe_rel_type}` {{relation_id: row.relation_id}}]->(target)
+            SET r.relation_type = row.relation_type,
+                r.papers = row.papers,
+                r.evidence_count = row.evidence_count,
+                r.confidence = row.confidence
+            """
+    
+    @staticmethod
+    def _relation_row(rel):
+        """Query parameters for one relation."""
+        return {
+            'source_id': rel['source'],
+            'target_id': rel['target'],
+            'relation_id': rel['relation_id'],
+            'relation_type': rel['relation'],
+            'papers': rel['papers'],
+            'evidence_count': rel['evidence_count'],
+            'confidence': rel.get('confidence', 0.5)
+        }
+    
+    def _write_relation_batch(self, work_item):
+        """
+        Write one (query, rows) relation batch in its own session (sessions are not
+        thread-safe). execute_write retries transient errors such as deadlocks,
+        which is safe because the query MERGEs on relation_id.
+        """
+        query, batch = work_item
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(self._run_batch, query, batch)
     
     def verify_import(self):
         """Verify the import was successful."""
         print("\n✅ Verifying import...")
         
-        with self.driver.session() as session:
-            # Count nodes
-            result = session.run("MATCH (e:Entity) RETURN count(e) as count")
-            node_count = result.single()['count']
-            print(f"  Entities in database: {node_count}")
-            
-            # Count relationships
-            result = session.run("MATCH ()-[r]->() RETURN count(r) as count")
-            rel_count = result.single()['count']
-            print(f"  Relations in database: {rel_count}")
-            
-            # Sample top entities
-            result = session.run(
-                """
+        # Node/relationship counts (served from the count store) and the top entities
+        # in a single round-trip
+        record = self.session.run(
+            """
+            CALL { MATCH (e:Entity) RETURN count(e) AS node_count }
+            CALL { MATCH ()-[r]->() RETURN count(r) AS rel_count }
+            CALL {
                 MATCH (e:Entity)
-                RETURN e.name as name, e.type as type, e.importance_score as score
-                ORDER BY e.importance_score DESC
-                LIMIT 5
-                """
-            )
-            
-            print(f"\n  Top 5 entities by importance:")
-            for i, record in enumerate(result, 1):
-                print(f"    {i}. {record['name']} ({record['type']}) - Score: {record['score']:.1f}")
+                WITH e ORDER BY e.importance_score DESC LIMIT 5
+                RETURN collect({name: e.name, type: e.type, score: e.importance_score}) AS top_entities
+            }
+            RETURN node_count, rel_count, top_entities
+            """
+        ).single()
+        
+        print(f"  Entities in database: {record['node_count']}")
+        print(f"  Relations in database: {record['rel_count']}")
+        
+        print(f"\n  Top 5 entities by importance:")
+        for i, entity in enumerate(record['top_entities'], 1):
+            print(f"    {i}. {entity['name']} ({entity['type']}) - Score: {entity['score']:.1f}")
     
     def print_sample_queries(self):
         """Print sample Cypher queries for exploration."""
@@ -246,12 +449,16 @@ class Neo4jGraphBuilder:
             print(f"   {query}")
 
 
-def build_neo4j_graph(clear_existing=True):
+def build_neo4j_graph(clear_existing=True, fast_load=False):
     """
     Main function to build Neo4j graph from filtered data.
     
     Args:
         clear_existing: Whether to clear existing data first
+        fast_load: With clear_existing, drop constraints/indexes, CREATE entities
+                   without index maintenance, then rebuild them before loading
+                   relations. Faster for one-shot imports, but duplicate entity_ids
+                   only surface as a failure when the constraint is recreated.
     """
     print("🚀 Starting Neo4j Graph Construction")
     print(f"📁 Reading from: {GRAPH_DATA_DIR}")
@@ -260,14 +467,9 @@ def build_neo4j_graph(clear_existing=True):
     entities_path = GRAPH_DATA_DIR / "filtered_entities.json"
     relations_path = GRAPH_DATA_DIR / "filtered_relations.json"
     
-    with open(entities_path, 'r', encoding='utf-8') as f:
-        entities = json.load(f)
-    
-    with open(relations_path, 'r', encoding='utf-8') as f:
-        relations = json.load(f)
-    
-    print(f"✓ Loaded {len(entities)} entities")
-    print(f"✓ Loaded {len(relations)} relations")
+    # Stream records straight into the UNWIND batches instead of loading whole files
+    entities = _iter_json_array(entities_path)
+    relations = _iter_json_array(relations_path)
     
     # Build graph using config
     builder = Neo4jGraphBuilder()
@@ -276,9 +478,14 @@ def build_neo4j_graph(clear_existing=True):
         if clear_existing:
             builder.clear_database()
         
-        builder.create_constraints()
-        builder.create_entities(entities)
-        builder.create_relations(relations)
+        if clear_existing and fast_load:
+            builder.drop_constraints()
+            entity_count = builder.create_entities(entities, merge=False)
+            builder.create_constraints()
+        else:
+            builder.create_constraints()
+            entity_count = builder.create_entities(entities)
+        relation_count = builder.create_relations(relations)
         builder.verify_import()
         builder.print_sample_queries()
         
@@ -298,13 +505,98 @@ def build_neo4j_graph(clear_existing=True):
         print(f"   URI: {config['uri']}")
         print(f"   Username: {config['user']}")
         print(f"\n📊 Graph contains:")
-        print(f"   - {len(entities)} entity nodes")
-        print(f"   - {len(relations)} relationship edges")
+        print(f"   - {entity_count} entity nodes")
+        print(f"   - {relation_count} relationship edges")
         
     finally:
         builder.close()
 
 
+def build_neo4j_graph_offline(staging_dir=None, database='neo4j', neo4j_admin='neo4j-admin'):
+    """
+    First-time load through the offline bulk importer instead of Cypher over Bolt.
+    
+    Writes the filtered data as neo4j-admin import CSVs and runs
+    `neo4j-admin database import full`, which rebuilds `database` from scratch.
+    Only for self-managed Neo4j: the server must be stopped while this runs
+    (not available on Aura). After restarting Neo4j, run
+    Neo4jGraphBuilder().create_constraints() to add the constraint and indexes.
+    
+    Args:
+        staging_dir: Directory for the import CSVs (default: graph_data/neo4j_import)
+        database: Database name to (re)create
+        neo4j_admin: Path to the neo4j-admin executable
+    
+    Returns:
+        Tuple of (entity_count, relation_count)
+    """
+    staging_dir = Path(staging_dir) if staging_dir else GRAPH_DATA_DIR / "neo4j_import"
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    nodes_csv = staging_dir / "entities.csv"
+    relationships_csv = staging_dir / "relations.csv"
+    
+    print("🚀 Starting offline Neo4j import")
+    print(f"📁 Staging CSVs in: {staging_dir}")
+    
+    # Array properties use neo4j-admin's default ';' delimiter
+    entity_count = 0
+    with open(nodes_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            'entity_id:ID', 'name', 'type', 'papers:string[]', 'paper_count:int',
+            'importance_score:float', 'relation_count:int', 'synonyms:string[]', ':LABEL'
+        ])
+        for entity in _iter_json_array(GRAPH_DATA_DIR / "filtered_entities.json"):
+            writer.writerow([
+                entity['entity_id'],
+                entity['name'],
+                entity['type'],
+                ';'.join(entity['papers']),
+                len(entity['papers']),
+                entity.get('importance_score', 0),
+                entity.get('relation_count', 0),
+                ';'.join(entity.get('synonyms', [])),
+                'Entity'
+            ])
+            entity_count += 1
+    
+    relation_count = 0
+    with open(relationships_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            ':START_ID', ':END_ID', 'relation_id', 'relation_type', 'papers:string[]',
+            'evidence_count:int', 'confidence:float', ':TYPE'
+        ])
+        for rel in _iter_json_array(GRAPH_DATA_DIR / "filtered_relations.json"):
+            writer.writerow([
+                rel['source'],
+                rel['target'],
+                rel['relation_id'],
+                rel['relation'],
+                ';'.join(rel['papers']),
+                rel['evidence_count'],
+                rel.get('confidence', 0.5),
+                rel['relation'].upper().translate(_REL_TYPE_TRANS)
+            ])
+            relation_count += 1
+    
+    print(f"✓ Wrote {entity_count} entities and {relation_count} relations")
+    
+    command = [
+        neo4j_admin, "database", "import", "full",
+        f"--nodes={nodes_csv}",
+        f"--relationships={relationships_csv}",
+        "--overwrite-destination=true",
+        database
+    ]
+    print(f"\n⚙️  Running: {' '.join(command)}")
+    subprocess.run(command, check=True)
+    
+    print("\n✅ OFFLINE IMPORT COMPLETE")
+    print("   Start Neo4j, then run Neo4jGraphBuilder().create_constraints()")
+    return entity_count, relation_count
+
+
 if __name__ == "__main__":
     import sys
     from config.neo4j_config import get_neo4j_config
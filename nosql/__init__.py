@@ -55,7 +55,16 @@ def _load_graph_client():
         return GraphPlaceholder
 
 
-# Export the selected client class as GraphClient
-GraphClient = _load_graph_client()
+def __getattr__(name):
+    """
+    Resolve GraphClient on first access (PEP 562) so importing nosql does not
+    pull in the neo4j driver until a client is actually needed.
+    """
+    if name == 'GraphClient':
+        client_class = _load_graph_client()
+        globals()['GraphClient'] = client_class
+        return client_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ['GraphClient']
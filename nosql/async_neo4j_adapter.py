@@ -0,0 +1,219 @@
+# nosql/async_neo4j_adapter.py
+"""
+Async Neo4j adapter for knowledge graph access.
+Mirrors the Neo4jAdapter read methods on neo4j.AsyncGraphDatabase so concurrent
+lookups can overlap their network waits on one event loop.
+
+Usage:
+    adapter = AsyncNeo4jAdapter()
+    entities = await asyncio.gather(*(adapter.get_entity_by_name(n) for n in names))
+"""
+
+from neo4j import AsyncGraphDatabase, READ_ACCESS
+import asyncio
+import os
+import sys
+import weakref
+
+# Add parent directory to path for config import
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from config.neo4j_config import get_neo4j_config, get_driver_options
+from nosql.neo4j_adapter import (
+    ENTITY_BY_NAME_QUERY,
+    ENTITIES_BY_TYPE_QUERY,
+    ENTITIES_QUERY,
+    RELATED_PAPERS_QUERY,
+    ENTITIES_BY_NAMES_QUERY,
+    RELATED_PAPERS_BULK_QUERY,
+    RELATIONS_BY_TYPE_QUERY,
+    RELATIONS_QUERY,
+)
+
+
+async def _fetch_records(tx, query, params):
+    """Transaction function: run a query and collect its records as they stream in."""
+    result = await tx.run(query, params)
+    return [record async for record in result]
+
+
+class AsyncNeo4jAdapter:
+    """
+    Async counterpart of Neo4jAdapter (read methods only).
+
+    Async drivers are bound to the event loop they were created on, so one
+    shared driver is kept per running loop and closed with close_driver().
+    """
+
+    _drivers = weakref.WeakKeyDictionary()
+
+    def __init__(self):
+        """Validate configuration. Raises ValueError if credentials are missing."""
+        config = get_neo4j_config()
+
+        if not config.get('uri'):
+            raise ValueError(
+                "NEO4J_URI environment variable is required. "
+                "Please set it in your .env file."
+            )
+        if not config.get('password'):
+            raise ValueError(
+                "NEO4J_PASSWORD environment variable is required. "
+                "Please set it in your .env file."
+            )
+
+        self.uri = config['uri']
+        self.user = config['user']
+        self.database = config['database']
+
+    @classmethod
+    async def get_driver(cls):
+        """
+        Return the shared async driver for the running event loop, creating and
+        verifying it on first call.
+
+        Raises:
+            ConnectionError: If the driver cannot connect to Neo4j
+        """
+        loop = asyncio.get_running_loop()
+        driver = cls._drivers.get(loop)
+        if driver is None:
+            config = get_neo4j_config()
+            # Registered before the first await so concurrent callers share it
+            driver = AsyncGraphDatabase.driver(
+                config['uri'],
+                auth=(config['user'], config['password']),
+                keep_alive=True,
+                **get_driver_options(config)
+            )
+            cls._drivers[loop] = driver
+            try:
+                await driver.verify_connectivity()
+            except Exception as e:
+                cls._drivers.pop(loop, None)
+                await driver.close()
+                raise ConnectionError(
+                    f"Failed to connect to Neo4j at {config['uri']}. "
+                    f"Error: {str(e)}. "
+                    f"Please check your NEO4J_URI, NEO4J_USER, and NEO4J_PASSWORD."
+                )
+        return driver
+
+    @classmethod
+    async def close_driver(cls):
+        """Close the shared driver of the running event loop, if any."""
+        driver = cls._drivers.pop(asyncio.get_running_loop(), None)
+        if driver is not None:
+            await driver.close()
+
+    async def _query(self, query, params):
+        """Run a read query in a managed read transaction."""
+        driver = await self.get_driver()
+        async with driver.session(database=self.database, default_access_mode=READ_ACCESS) as session:
+            return await session.execute_read(_fetch_records, query, params)
+
+    async def get_entity_by_name(self, name):
+        """
+        Look up an entity by name.
+
+        Args:
+            name: Entity name to search for (case-insensitive)
+
+        Returns:
+            Entity dict or None if not found
+        """
+        records = await self._query(ENTITY_BY_NAME_QUERY, {'name': name})
+        return records[0]['entity'] if records else None
+
+    async def get_entities(self, entity_type=None, limit=50):
+        """
+        Returns a list of entity dictionaries from Neo4j.
+
+        Args:
+            entity_type: Filter by entity type (e.g., 'gene', 'protein'). None = all types.
+            limit: Maximum number of entities to return (default: 50)
+
+        Returns:
+            List of dicts with keys: entity_id, name, type, importance_score, paper_count, relation_count
+        """
+        if entity_type:
+            records = await self._query(
+                ENTITIES_BY_TYPE_QUERY, {'entity_type': entity_type, 'limit': limit}
+            )
+        else:
+            records = await self._query(ENTITIES_QUERY, {'limit': limit})
+        return [record['entity'] for record in records]
+
+    async def get_related_papers(self, entity_id, limit=20):
+        """
+        Returns list of paper_ids related to this entity.
+
+        Args:
+            entity_id: The entity ID to find papers for
+            limit: Maximum number of papers to return (default: 20)
+
+        Returns:
+            List of paper IDs (strings) where this entity appears
+        """
+        records = await self._query(RELATED_PAPERS_QUERY, {'entity_id': entity_id, 'limit': limit})
+        return records[0]['papers'] if records else []
+
+    async def get_entities_by_names(self, names):
+        """
+        Look up several entities by name in a single round trip.
+
+        Args:
+            names: Iterable of entity names to search for (case-insensitive)
+
+        Returns:
+            Dict mapping each input name to its entity dict, or None if not found
+        """
+        names = list(dict.fromkeys(names))
+        found = {}
+        if names:
+            records = await self._query(ENTITIES_BY_NAMES_QUERY, {'names': names})
+            found = {record['key']: record['entity'] for record in records}
+        return {name: found.get(name) for name in names}
+
+    async def get_related_papers_bulk(self, entity_ids, limit=20):
+        """
+        Returns related paper_ids for several entities in a single round trip.
+
+        Args:
+            entity_ids: Iterable of entity IDs to find papers for
+            limit: Maximum number of papers to return per entity (default: 20)
+
+        Returns:
+            Dict mapping each input entity ID to a list of paper IDs
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        found = {}
+        if entity_ids:
+            records = await self._query(
+                RELATED_PAPERS_BULK_QUERY, {'entity_ids': entity_ids, 'limit': limit}
+            )
+            found = {record['key']: record['papers'] for record in records}
+        return {entity_id: found.get(entity_id, []) for entity_id in entity_ids}
+
+    async def get_entity_relations(self, entity_id, relation_type=None, paper_limit=None):
+        """
+        Returns graph edges / relation triples involving this entity.
+
+        Args:
+            entity_id: The entity ID to find relations for
+            relation_type: Filter by relation type (e.g., 'increases', 'affects'). None = all types.
+            paper_limit: Maximum number of paper IDs returned per relation. None = all.
+
+        Returns:
+            List of dicts with keys: source, relation, target, evidence_count, confidence, papers
+        """
+        if relation_type:
+            records = await self._query(
+                RELATIONS_BY_TYPE_QUERY,
+                {'entity_id': entity_id, 'relation_type': relation_type.upper(),
+                 'paper_limit': paper_limit}
+            )
+        else:
+            records = await self._query(
+                RELATIONS_QUERY, {'entity_id': entity_id, 'paper_limit': paper_limit}
+            )
+        return [record['relation'] for record in records]
@@ -0,0 +1,114 @@
+# nosql/cache.py
+"""
+Small thread-safe LRU + TTL cache for read-only graph queries.
+
+The knowledge graph is rebuilt offline and changes rarely while the dashboard
+is running, so repeated lookups of popular entities can be served from memory.
+
+Usage:
+    class Adapter:
+        _cache = TTLCache(maxsize=2048, ttl=300)
+
+        @cached(lambda self, name: ('ebn', name.lower()))
+        def get_entity_by_name(self, name):
+            ...
+"""
+
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries also expire after a fixed age.
+
+    Args:
+        maxsize: Maximum number of entries kept before evicting the oldest-used
+        ttl: Seconds an entry stays valid after it was stored
+    """
+
+    def __init__(self, maxsize=2048, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if absent or expired."""
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Returns:
+            Dict with keys: size, maxsize, ttl, hits, misses, hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+def cached(key):
+    """
+    Cache a method's result in the owning object's `_cache` (a TTLCache).
+
+    The cache is shared across callers, so each caller gets its own deep copy
+    of the cached value and may modify it freely.
+
+    Args:
+        key: Function called with the method's arguments that returns a hashable
+            cache key, or None to bypass the cache for that call
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache_key = key(self, *args, **kwargs)
+            if cache_key is None:
+                return method(self, *args, **kwargs)
+
+            value = self._cache.get(cache_key, _MISSING)
+            if value is _MISSING:
+                value = method(self, *args, **kwargs)
+                self._cache.set(cache_key, copy.deepcopy(value))
+                return value
+            return copy.deepcopy(value)
+        return wrapper
+    return decorator
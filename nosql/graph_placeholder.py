@@ -7,6 +7,87 @@ Use this when KG_ADAPTER=placeholder or when Neo4j is unavailable.
 """
 
 import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pandas as pd
+
+from nosql.schema import ENTITY_COLUMNS, RELATION_COLUMNS
+
+# Demo entities based on common space biology topics (fallback display data)
+_DEMO_ENTITIES = [
+    {
+        'entity_id': 'DEMO_001',
+        'name': 'spaceflight',
+        'type': 'condition',
+        'importance_score': 100.0,
+        'paper_count': 20,
+        'relation_count': 45
+    },
+    {
+        'entity_id': 'DEMO_002',
+        'name': 'microgravity',
+        'type': 'condition',
+        'importance_score': 95.0,
+        'paper_count': 18,
+        'relation_count': 40
+    },
+    {
+        'entity_id': 'DEMO_003',
+        'name': 'radiation',
+        'type': 'condition',
+        'importance_score': 90.0,
+        'paper_count': 15,
+        'relation_count': 35
+    },
+    {
+        'entity_id': 'DEMO_004',
+        'name': 'mouse',
+        'type': 'organism',
+        'importance_score': 85.0,
+        'paper_count': 25,
+        'relation_count': 50
+    },
+    {
+        'entity_id': 'DEMO_005',
+        'name': 'bone',
+        'type': 'tissue',
+        'importance_score': 80.0,
+        'paper_count': 12,
+        'relation_count': 30
+    },
+    {
+        'entity_id': 'DEMO_006',
+        'name': 'cell',
+        'type': 'cell_type',
+        'importance_score': 75.0,
+        'paper_count': 22,
+        'relation_count': 48
+    },
+    {
+        'entity_id': 'DEMO_007',
+        'name': 'gene expression',
+        'type': 'process',
+        'importance_score': 70.0,
+        'paper_count': 16,
+        'relation_count': 38
+    },
+    {
+        'entity_id': 'DEMO_008',
+        'name': 'immune system',
+        'type': 'tissue',
+        'importance_score': 65.0,
+        'paper_count': 14,
+        'relation_count': 32
+    }
+]
+
+# Lookup tables built once at import
+_DEMO_BY_NAME = {e['name'].lower(): e for e in _DEMO_ENTITIES}
+
+_DEMO_BY_TYPE = defaultdict(list)
+for _entity in _DEMO_ENTITIES:
+    _DEMO_BY_TYPE[_entity['type']].append(_entity)
 
 
 class GraphPlaceholder:
@@ -28,12 +109,20 @@ class GraphPlaceholder:
             "Set KG_ADAPTER=neo4j in .env to connect to Neo4j Aura.",
             UserWarning
         )
-        self._demo_entities = self._generate_demo_entities()
     
     def close(self):
         """Close connection (no-op for placeholder)."""
         pass
     
+    def warmup(self):
+        """Warm query plans (no-op for placeholder)."""
+        return 0
+    
+    @contextmanager
+    def batch(self):
+        """Share one session across chained lookups (yields self for placeholder)."""
+        yield self
+    
     def get_entity_by_name(self, name):
         """
         Look up an entity by name (returns demo data).
@@ -45,11 +134,7 @@ class GraphPlaceholder:
             Demo entity dict or None
         """
         # Return demo entity for common search terms
-        name_lower = name.lower()
-        for entity in self._demo_entities:
-            if entity['name'].lower() == name_lower:
-                return entity
-        return None
+        return _DEMO_BY_NAME.get(name.lower())
     
     def get_entities(self, entity_type=None, limit=50):
         """
@@ -62,12 +147,10 @@ class GraphPlaceholder:
         Returns:
             List of demo entity dicts
         """
-        entities = self._demo_entities
-        
         if entity_type:
-            entities = [e for e in entities if e['type'] == entity_type]
+            return _DEMO_BY_TYPE.get(entity_type, [])[:limit]
         
-        return entities[:limit]
+        return _DEMO_ENTITIES[:limit]
     
     def get_related_papers(self, entity_id, limit=20):
         """
@@ -83,13 +166,39 @@ class GraphPlaceholder:
         # Return empty list - no paper relationships in placeholder mode
         return []
     
-    def get_entity_relations(self, entity_id, relation_type=None):
+    def get_entities_by_names(self, names):
+        """
+        Look up several entities by name (returns demo data).
+        
+        Args:
+            names: Iterable of entity names to search for
+        
+        Returns:
+            Dict mapping each input name to a demo entity dict or None
+        """
+        return {name: _DEMO_BY_NAME.get(name.lower()) for name in names}
+    
+    def get_related_papers_bulk(self, entity_ids, limit=20):
+        """
+        Returns demo paper_ids for several entities.
+        
+        Args:
+            entity_ids: Iterable of entity IDs to find papers for
+            limit: Maximum number of papers to return per entity
+        
+        Returns:
+            Dict mapping each input entity ID to a list of paper IDs (empty in placeholder)
+        """
+        return {entity_id: [] for entity_id in entity_ids}
+    
+    def get_entity_relations(self, entity_id, relation_type=None, paper_limit=None):
         """
         Returns demo graph relations.
         
         Args:
             entity_id: The entity ID to find relations for
             relation_type: Filter by relation type
+            paper_limit: Maximum number of paper IDs per relation
         
         Returns:
             List of demo relation dicts (empty in placeholder)
@@ -97,6 +206,26 @@ class GraphPlaceholder:
         # Return empty list - no relations in placeholder mode
         return []
     
+    def get_entities_df(self, entity_type=None, limit=50):
+        """
+        Returns demo entities as a DataFrame.
+        
+        Returns:
+            DataFrame with columns ENTITY_COLUMNS
+        """
+        return pd.DataFrame.from_records(
+            self.get_entities(entity_type, limit), columns=ENTITY_COLUMNS
+        )
+    
+    def get_entity_relations_df(self, entity_id, relation_type=None, paper_limit=None):
+        """
+        Returns demo relations as a DataFrame.
+        
+        Returns:
+            DataFrame with columns RELATION_COLUMNS (empty in placeholder)
+        """
+        return pd.DataFrame(columns=RELATION_COLUMNS)
+    
     def upsert_paper(self, paper):
         """
         Upsert paper (no-op in placeholder).
@@ -138,73 +267,3 @@ class GraphPlaceholder:
             "Use KG_ADAPTER=neo4j to persist data.",
             UserWarning
         )
-    
-    def _generate_demo_entities(self):
-        """Generate demo entities from cluster keywords for fallback display."""
-        # Demo entities based on common space biology topics
-        return [
-            {
-                'entity_id': 'DEMO_001',
-                'name': 'spaceflight',
-                'type': 'condition',
-                'importance_score': 100.0,
-                'paper_count': 20,
-                'relation_count': 45
-            },
-            {
-                'entity_id': 'DEMO_002',
-                'name': 'microgravity',
-                'type': 'condition',
-                'importance_score': 95.0,
-                'paper_count': 18,
-                'relation_count': 40
-            },
-            {
-                'entity_id': 'DEMO_003',
-                'name': 'radiation',
-                'type': 'condition',
-                'importance_score': 90.0,
-                'paper_count': 15,
-                'relation_count': 35
-            },
-            {
-                'entity_id': 'DEMO_004',
-                'name': 'mouse',
-                'type': 'organism',
-                'importance_score': 85.0,
-                'paper_count': 25,
-                'relation_count': 50
-            },
-            {
-                'entity_id': 'DEMO_005',
-                'name': 'bone',
-                'type': 'tissue',
-                'importance_score': 80.0,
-                'paper_count': 12,
-                'relation_count': 30
-            },
-            {
-                'entity_id': 'DEMO_006',
-                'name': 'cell',
-                'type': 'cell_type',
-                'importance_score': 75.0,
-                'paper_count': 22,
-                'relation_count': 48
-            },
-            {
-                'entity_id': 'DEMO_007',
-                'name': 'gene expression',
-                'type': 'process',
-                'importance_score': 70.0,
-                'paper_count': 16,
-                'relation_count': 38
-            },
-            {
-                'entity_id': 'DEMO_008',
-                'name': 'immune system',
-                'type': 'tissue',
-                'importance_score': 65.0,
-                'paper_count': 14,
-                'relation_count': 32
-            }
-        ]
@@ -4,13 +4,129 @@ Neo4j adapter for knowledge graph access.
 Provides programmatic access to the Neo4j knowledge graph for dashboard integration.
 """
 
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, READ_ACCESS
+import pandas as pd
+from contextlib import contextmanager
+import atexit
+import copy
 import os
 import sys
+import threading
 
 # Add parent directory to path for config import
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from config.neo4j_config import get_neo4j_config
+from config.neo4j_config import get_neo4j_config, get_driver_options
+from nosql.cache import TTLCache, cached
+from nosql.schema import ENTITY_COLUMNS, RELATION_COLUMNS
+
+# Larger limits are one-off requests; caching them would just evict hot keys
+MAX_CACHED_LIMIT = 200
+
+_cache_config = get_neo4j_config()
+_query_cache = TTLCache(maxsize=_cache_config['cache_size'], ttl=_cache_config['cache_ttl'])
+
+
+# Read queries (constant text so Neo4j reuses one cached plan per query)
+ENTITY_BY_NAME_QUERY = """
+MATCH (e:Entity)
+WHERE toLower(e.name) = toLower($name)
+RETURN e {.entity_id, .name, .type, .importance_score,
+          paper_count: size(e.papers), .relation_count} AS entity
+LIMIT 1
+"""
+
+ENTITIES_BY_TYPE_QUERY = """
+MATCH (e:Entity)
+WHERE e.type = $entity_type
+RETURN e {.entity_id, .name, .type, .importance_score,
+          paper_count: size(e.papers), .relation_count} AS entity
+ORDER BY e.importance_score DESC
+LIMIT $limit
+"""
+
+ENTITIES_QUERY = """
+MATCH (e:Entity)
+RETURN e {.entity_id, .name, .type, .importance_score,
+          paper_count: size(e.papers), .relation_count} AS entity
+ORDER BY e.importance_score DESC
+LIMIT $limit
+"""
+
+RELATED_PAPERS_QUERY = """
+MATCH (e:Entity {entity_id: $entity_id})
+RETURN coalesce(e.papers, [])[0..$limit] AS papers
+"""
+
+ENTITIES_BY_NAMES_QUERY = """
+UNWIND $names AS nm
+MATCH (e:Entity)
+WHERE toLower(e.name) = toLower(nm)
+WITH nm, collect(e)[0] AS e
+RETURN nm AS key,
+       e {.entity_id, .name, .type, .importance_score,
+          paper_count: size(e.papers), .relation_count} AS entity
+"""
+
+RELATED_PAPERS_BULK_QUERY = """
+UNWIND $entity_ids AS id
+MATCH (e:Entity {entity_id: id})
+RETURN id AS key, coalesce(e.papers, [])[0..$limit] AS papers
+"""
+
+_RELATION_PROJECTION = """RETURN {source: source.name, source_id: source.entity_id,
+        relation: r.relation_type,
+        target: target.name, target_id: target.entity_id,
+        evidence_count: r.evidence_count, confidence: r.confidence,
+        papers: CASE WHEN $paper_limit IS NULL THEN coalesce(r.papers, [])
+                     ELSE coalesce(r.papers, [])[0..$paper_limit] END} AS relation"""
+
+# Outgoing and incoming halves each start from an entity_id index seek; the
+# second half skips self-loops so UNION ALL never returns an edge twice
+RELATIONS_BY_TYPE_QUERY = """
+MATCH (source:Entity {entity_id: $entity_id})-[r]->(target:Entity)
+WHERE type(r) = $relation_type
+""" + _RELATION_PROJECTION + """
+UNION ALL
+MATCH (source:Entity)-[r]->(target:Entity {entity_id: $entity_id})
+WHERE type(r) = $relation_type AND source.entity_id <> $entity_id
+""" + _RELATION_PROJECTION + "\n"
+
+RELATIONS_QUERY = """
+MATCH (source:Entity {entity_id: $entity_id})-[r]->(target:Entity)
+""" + _RELATION_PROJECTION + """
+UNION ALL
+MATCH (source:Entity)-[r]->(target:Entity {entity_id: $entity_id})
+WHERE source.entity_id <> $entity_id
+""" + _RELATION_PROJECTION + "\n"
+
+
+READ_QUERIES = [
+    ENTITY_BY_NAME_QUERY,
+    ENTITIES_BY_TYPE_QUERY,
+    ENTITIES_QUERY,
+    RELATED_PAPERS_QUERY,
+    ENTITIES_BY_NAMES_QUERY,
+    RELATED_PAPERS_BULK_QUERY,
+    RELATIONS_BY_TYPE_QUERY,
+    RELATIONS_QUERY,
+]
+
+# Matches nothing, but binds every parameter any read or NL template uses
+_WARMUP_PARAMS = {
+    'name': '__noop__', 'entity': '__noop__', 'entity1': '__noop__', 'entity2': '__noop__',
+    'entity_id': '__noop__', 'entity_type': '__noop__', 'type': '__noop__',
+    'relation_type': '__NOOP__', 'relation': '__noop__',
+    'names': [], 'entity_ids': [], 'limit': 1, 'paper_limit': None
+}
+
+# Plans are cached per parameter types too: relations are fetched with
+# paper_limit=None by default and with an integer limit (e.g. 0) by callers
+_WARMUP_PAPER_LIMITS = (None, 0)
+
+
+def _fetch_records(tx, query, params):
+    """Transaction function: run a query and materialize its records."""
+    return list(tx.run(query, params))
 
 
 class Neo4jAdapter:
@@ -22,8 +138,46 @@ class Neo4jAdapter:
         NEO4J_URI: Neo4j connection URI (e.g., neo4j+s://xxxxx.databases.neo4j.io)
         NEO4J_USER: Neo4j username (typically 'neo4j')
         NEO4J_PASSWORD: Neo4j password
+    
+    All adapter instances share one driver (and its Bolt connection pool), created
+    on first use by get_driver(), and one LRU + TTL cache for read queries.
     """
     
+    _driver = None
+    _driver_lock = threading.Lock()
+    _bound_session = None
+    _cache = _query_cache
+    
+    @classmethod
+    def get_driver(cls):
+        """
+        Return the shared Neo4j driver, creating and verifying it on first call.
+        
+        Raises:
+            ConnectionError: If the driver cannot connect to Neo4j
+        """
+        if cls._driver is None:
+            with cls._driver_lock:
+                if cls._driver is None:
+                    config = get_neo4j_config()
+                    try:
+                        driver = GraphDatabase.driver(
+                            config['uri'],
+                            auth=(config['user'], config['password']),
+                            keep_alive=True,
+                            **get_driver_options(config)
+                        )
+                        driver.verify_connectivity()
+                    except Exception as e:
+                        raise ConnectionError(
+                            f"Failed to connect to Neo4j at {config['uri']}. "
+                            f"Error: {str(e)}. "
+                            f"Please check your NEO4J_URI, NEO4J_USER, and NEO4J_PASSWORD."
+                        )
+                    atexit.register(driver.close)
+                    cls._driver = driver
+        return cls._driver
+    
     def __init__(self):
         """Initialize Neo4j connection. Raises ValueError if credentials are missing."""
         config = get_neo4j_config()
@@ -42,24 +196,85 @@ class Neo4jAdapter:
         
         self.uri = config['uri']
         self.user = config['user']
-        self.password = config['password']
-        
-        try:
-            self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-            # Verify connection
-            self.driver.verify_connectivity()
-        except Exception as e:
-            raise ConnectionError(
-                f"Failed to connect to Neo4j at {self.uri}. "
-                f"Error: {str(e)}. "
-                f"Please check your NEO4J_URI, NEO4J_USER, and NEO4J_PASSWORD."
-            )
+        self.database = config['database']
+        
+        # Reuses the pooled driver; only the first adapter pays connect + verify
+        self.driver = self.get_driver()
     
     def close(self):
-        """Close the Neo4j driver connection."""
-        if self.driver:
-            self.driver.close()
+        """
+        Release this adapter. The shared driver stays open for other adapters
+        and is closed at interpreter exit.
+        """
+        self.driver = None
+    
+    @classmethod
+    def invalidate_cache(cls):
+        """Drop all cached query results (call after the graph is rebuilt)."""
+        cls._cache.clear()
+    
+    @classmethod
+    def cache_stats(cls):
+        """
+        Returns:
+            Dict with keys: size, maxsize, ttl, hits, misses, hit_rate
+        """
+        return cls._cache.stats()
     
+    def warmup(self):
+        """
+        Run every adapter and NL-to-Cypher query template once with parameters
+        that match nothing, so Neo4j has a cached plan for each before the first
+        real request.
+        
+        Returns:
+            Number of templates warmed
+        """
+        from nosql.nl_to_cypher import query_templates
+        
+        templates = READ_QUERIES + query_templates()
+        with self.batch() as graph:
+            for query in templates:
+                if '$paper_limit' in query:
+                    for paper_limit in _WARMUP_PAPER_LIMITS:
+                        graph._query(query, {**_WARMUP_PARAMS, 'paper_limit': paper_limit})
+                else:
+                    graph._query(query, _WARMUP_PARAMS)
+        return len(templates)
+    
+    def _read_session(self):
+        """Open a session routed to read replicas."""
+        return self.driver.session(database=self.database, default_access_mode=READ_ACCESS)
+    
+    def _query(self, query, params):
+        """
+        Run a read query in a managed read transaction, on the batch session
+        when this adapter is bound to one, otherwise on a fresh session.
+        """
+        if self._bound_session is not None:
+            return self._bound_session.execute_read(_fetch_records, query, params)
+        with self._read_session() as session:
+            return session.execute_read(_fetch_records, query, params)
+    
+    @contextmanager
+    def batch(self):
+        """
+        Share one session across several chained lookups.
+        
+        Usage:
+            with adapter.batch() as graph:
+                entity = graph.get_entity_by_name('microgravity')
+                relations = graph.get_entity_relations(entity['entity_id'])
+        
+        Yields:
+            A copy of this adapter whose queries all run on the same session
+        """
+        with self._read_session() as session:
+            bound = copy.copy(self)
+            bound._bound_session = session
+            yield bound
+    
+    @cached(lambda self, name: ('entity_by_name', name.lower()))
     def get_entity_by_name(self, name):
         """
         Look up an entity by name.
@@ -70,32 +285,13 @@ class Neo4jAdapter:
         Returns:
             Entity dict or None if not found
         """
-        with self.driver.session() as session:
-            query = """
-            MATCH (e:Entity)
-            WHERE toLower(e.name) = toLower($name)
-            RETURN e.entity_id AS entity_id,
-                   e.name AS name,
-                   e.type AS type,
-                   e.importance_score AS importance_score,
-                   size(e.papers) AS paper_count,
-                   e.relation_count AS relation_count
-            LIMIT 1
-            """
-            result = session.run(query, name=name)
-            record = result.single()
-            
-            if record:
-                return {
-                    'entity_id': record['entity_id'],
-                    'name': record['name'],
-                    'type': record['type'],
-                    'importance_score': record['importance_score'],
-                    'paper_count': record['paper_count'],
-                    'relation_count': record['relation_count']
-                }
-            return None
+        query = ENTITY_BY_NAME_QUERY
+        records = self._query(query, {'name': name})
+        
+        return records[0]['entity'] if records else None
     
+    @cached(lambda self, entity_type=None, limit=50:
+            ('entities', entity_type, limit) if limit <= MAX_CACHED_LIMIT else None)
     def get_entities(self, entity_type=None, limit=50):
         """
         Returns a list of entity dictionaries from Neo4j.
@@ -107,48 +303,18 @@ class Neo4jAdapter:
         Returns:
             List of dicts with keys: entity_id, name, type, importance_score, paper_count, relation_count
         """
-        with self.driver.session() as session:
-            if entity_type:
-                query = """
-                MATCH (e:Entity)
-                WHERE e.type = $entity_type
-                RETURN e.entity_id AS entity_id, 
-                       e.name AS name, 
-                       e.type AS type,
-                       e.importance_score AS importance_score,
-                       size(e.papers) AS paper_count,
-                       e.relation_count AS relation_count
-                ORDER BY e.importance_score DESC
-                LIMIT $limit
-                """
-                result = session.run(query, entity_type=entity_type, limit=limit)
-            else:
-                query = """
-                MATCH (e:Entity)
-                RETURN e.entity_id AS entity_id, 
-                       e.name AS name, 
-                       e.type AS type,
-                       e.importance_score AS importance_score,
-                       size(e.papers) AS paper_count,
-                       e.relation_count AS relation_count
-                ORDER BY e.importance_score DESC
-                LIMIT $limit
-                """
-                result = session.run(query, limit=limit)
-            
-            entities = []
-            for record in result:
-                entities.append({
-                    'entity_id': record['entity_id'],
-                    'name': record['name'],
-                    'type': record['type'],
-                    'importance_score': record['importance_score'],
-                    'paper_count': record['paper_count'],
-                    'relation_count': record['relation_count']
-                })
-            
-            return entities
+        if entity_type:
+            query = ENTITIES_BY_TYPE_QUERY
+            params = {'entity_type': entity_type, 'limit': limit}
+        else:
+            query = ENTITIES_QUERY
+            params = {'limit': limit}
+        
+        records = self._query(query, params)
+        return [record['entity'] for record in records]
 
+    @cached(lambda self, entity_id, limit=20:
+            ('related_papers', entity_id, limit) if limit <= MAX_CACHED_LIMIT else None)
     def get_related_papers(self, entity_id, limit=20):
         """
         Returns list of paper_ids related to this entity.
@@ -160,76 +326,98 @@ class Neo4jAdapter:
         Returns:
             List of paper IDs (strings) where this entity appears
         """
-        with self.driver.session() as session:
-            query = """
-            MATCH (e:Entity {entity_id: $entity_id})
-            RETURN e.papers AS papers
-            """
-            result = session.run(query, entity_id=entity_id)
-            record = result.single()
-            
-            if record and record['papers']:
-                papers_list = list(record['papers'])
-                return papers_list[:limit]
-            return []
-
-    def get_entity_relations(self, entity_id, relation_type=None):
+        query = RELATED_PAPERS_QUERY
+        records = self._query(query, {'entity_id': entity_id, 'limit': limit})
+        
+        return records[0]['papers'] if records else []
+
+    def get_entities_by_names(self, names):
+        """
+        Look up several entities by name in a single round trip.
+        
+        Args:
+            names: Iterable of entity names to search for (case-insensitive)
+        
+        Returns:
+            Dict mapping each input name to its entity dict, or None if not found
+        """
+        names = list(dict.fromkeys(names))
+        found = {}
+        if names:
+            query = ENTITIES_BY_NAMES_QUERY
+            records = self._query(query, {'names': names})
+            found = {record['key']: record['entity'] for record in records}
+        
+        return {name: found.get(name) for name in names}
+
+    def get_related_papers_bulk(self, entity_ids, limit=20):
+        """
+        Returns related paper_ids for several entities in a single round trip.
+        
+        Args:
+            entity_ids: Iterable of entity IDs to find papers for
+            limit: Maximum number of papers to return per entity (default: 20)
+        
+        Returns:
+            Dict mapping each input entity ID to a list of paper IDs
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        found = {}
+        if entity_ids:
+            query = RELATED_PAPERS_BULK_QUERY
+            records = self._query(query, {'entity_ids': entity_ids, 'limit': limit})
+            found = {record['key']: record['papers'] for record in records}
+        
+        return {entity_id: found.get(entity_id, []) for entity_id in entity_ids}
+
+    @cached(lambda self, entity_id, relation_type=None, paper_limit=None:
+            ('entity_relations', entity_id, relation_type, paper_limit))
+    def get_entity_relations(self, entity_id, relation_type=None, paper_limit=None):
         """
         Returns graph edges / relation triples involving this entity.
         
         Args:
             entity_id: The entity ID to find relations for
             relation_type: Filter by relation type (e.g., 'increases', 'affects'). None = all types.
+            paper_limit: Maximum number of paper IDs returned per relation. None = all.
         
         Returns:
             List of dicts with keys: source, relation, target, evidence_count, confidence, papers
         """
-        with self.driver.session() as session:
-            if relation_type:
-                # Get relations where entity is source OR target, filtered by type
-                # Neo4j relationship type names are uppercase, so convert for matching
-                neo4j_rel_type = relation_type.upper()
-                query = """
-                MATCH (source:Entity)-[r]->(target:Entity)
-                WHERE (source.entity_id = $entity_id OR target.entity_id = $entity_id)
-                  AND type(r) = $relation_type
-                RETURN source.name AS source_name,
-                       source.entity_id AS source_id,
-                       r.relation_type AS relation_type,
-                       target.name AS target_name,
-                       target.entity_id AS target_id,
-                       r.evidence_count AS evidence_count,
-                       r.confidence AS confidence,
-                       r.papers AS papers
-                """
-                result = session.run(query, entity_id=entity_id, relation_type=neo4j_rel_type)
-            else:
-                # Get all relations where entity is source OR target
-                query = """
-                MATCH (source:Entity)-[r]->(target:Entity)
-                WHERE source.entity_id = $entity_id OR target.entity_id = $entity_id
-                RETURN source.name AS source_name,
-                       source.entity_id AS source_id,
-                       r.relation_type AS relation_type,
-                       target.name AS target_name,
-                       target.entity_id AS target_id,
-                       r.evidence_count AS evidence_count,
-                       r.confidence AS confidence,
-                       r.papers AS papers
-                """
-                result = session.run(query, entity_id=entity_id)
-            
-            relations = []
-            for record in result:
-                relations.append({
-                    'source': record['source_name'],
-                    'source_id': record['source_id'],
-                    'relation': record['relation_type'],
-                    'target': record['target_name'],
-                    'target_id': record['target_id'],
-                    'evidence_count': record['evidence_count'],
-                    'confidence': record['confidence'],
-                    'papers': list(record['papers']) if record['papers'] else []
-                })
-            
-            return relations
+        if relation_type:
+            # Get relations where entity is source OR target, filtered by type
+            # Neo4j relationship type names are uppercase, so convert for matching
+            neo4j_rel_type = relation_type.upper()
+            query = RELATIONS_BY_TYPE_QUERY
+            params = {'entity_id': entity_id, 'relation_type': neo4j_rel_type,
+                      'paper_limit': paper_limit}
+        else:
+            # Get all relations where entity is source OR target
+            query = RELATIONS_QUERY
+            params = {'entity_id': entity_id, 'paper_limit': paper_limit}
+        
+        records = self._query(query, params)
+        return [record['relation'] for record in records]
+
+    def get_entities_df(self, entity_type=None, limit=50):
+        """
+        Same as get_entities, as a columnar DataFrame (one column per field).
+        
+        Returns:
+            DataFrame with columns ENTITY_COLUMNS
+        """
+        return pd.DataFrame.from_records(
+            self.get_entities(entity_type, limit), columns=ENTITY_COLUMNS
+        )
+    
+    def get_entity_relations_df(self, entity_id, relation_type=None, paper_limit=None):
+        """
+        Same as get_entity_relations, as a columnar DataFrame (one column per field).
+        
+        Returns:
+            DataFrame with columns RELATION_COLUMNS
+        """
+        return pd.DataFrame.from_records(
+            self.get_entity_relations(entity_id, relation_type, paper_limit),
+            columns=RELATION_COLUMNS
+        )
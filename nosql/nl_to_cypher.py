@@ -2,67 +2,168 @@
 """
 Natural Language to Cypher Query Converter
 Converts English questions to Cypher queries for Neo4j
+
+Query templates are constant strings; user input is only ever passed as Cypher
+parameters, so each template maps to a single cached Neo4j execution plan.
+
+When google-re2 is installed, patterns run on RE2 (linear-time, no backtracking)
+and all of them are matched together in one RE2::Set scan.
 """
 import re
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Pattern kinds: decide how a match's captured groups map to query parameters
+ENTITY = 'entity'                    # (entity)
+RELATION_ENTITY = 'relation_entity'  # (relation, entity)
+TYPED_ENTITY = 'typed_entity'        # (type, entity)
+TOPN = 'topn'                        # (limit or None)
+TYPE_LIST = 'type_list'              # (type)
+PATH = 'path'                        # (entity1, entity2)
+
+DEFAULT_TOP_LIMIT = 10
+
+_TRAILING_PUNCTUATION = '?!.,;:'
+
+# Clauses that make a Cypher statement need a write transaction
+_WRITE_CLAUSE_RE = re.compile(
+    r'\b(?:CREATE|MERGE|SET|DELETE|REMOVE|DROP|FOREACH|LOAD\s+CSV|CALL)\b',
+    re.IGNORECASE
+)
+
+
+# Common query patterns: (regex, cypher_template, description, kind, trigger_keywords)
+# A pattern is only tried when one of its trigger keywords occurs in the query
+# (as a substring, since the regexes match inside words too)
+_RAW_PATTERNS = [
+    # "What affects X?"
+    (r"what (?:affects|impacts|influences) (.+)",
+     "MATCH (n:Entity)-[r:AFFECTS|INCREASES|DECREASES|INDUCES]->(m:Entity) WHERE toLower(m.name) = toLower($entity) RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
+     "Finding what affects {entity}",
+     ENTITY,
+     ('affects', 'impacts', 'influences')),
+    
+    # "What is affected by X?"
+    (r"what (?:is )?affected by (.+)",
+     "MATCH (n:Entity)-[r:AFFECTS|INCREASES|DECREASES|INDUCES]->(m:Entity) WHERE toLower(n.name) = toLower($entity) RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
+     "Finding what is affected by {entity}",
+     ENTITY,
+     ('affected',)),
+    
+    # "What causes X?"
+    (r"what causes (.+)",
+     "MATCH (n:Entity)-[r]->(m:Entity) WHERE toLower(m.name) = toLower($entity) AND (r.relation_type = 'causes' OR r.relation_type = 'induces') RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
+     "Finding what causes {entity}",
+     ENTITY,
+     ('causes',)),
+    
+    # "What increases/decreases X?"
+    (r"what (increases|decreases) (.+)",
+     "MATCH (n:Entity)-[r]->(m:Entity) WHERE toLower(m.name) = toLower($entity) AND r.relation_type = $relation RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
+     "Finding what {relation} {entity}",
+     RELATION_ENTITY,
+     ('increases', 'decreases')),
+    
+    # "Show relationships for X"
+    (r"(?:show|find|get) (?:relationships|relations|connections) (?:for|of) (.+)",
+     "MATCH (n:Entity)-[r]-(m:Entity) WHERE toLower(n.name) = toLower($entity) RETURN n.name as entity1, r.relation_type as relation, m.name as entity2, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 30",
+     "Finding all relationships for {entity}",
+     ENTITY,
+     ('relationships', 'relations', 'connections')),
+    
+    # "Find genes related to X"
+    (r"(?:find|show|get) (gene|protein|tissue|condition|organism|chemical|disease)s? (?:related to|associated with) (.+)",
+     "MATCH (n:Entity)-[r]-(m:Entity) WHERE toLower(m.name) = toLower($entity) AND n.type = $type RETURN n.name as name, n.type as type, r.relation_type as relation, m.name as related_to, r.evidence_count as evidence ORDER BY r.evidence_count DESC LIMIT 20",
+     "Finding {type} related to {entity}",
+     TYPED_ENTITY,
+     ('related', 'associated')),
+    
+    # "What are the top entities?"
+    (r"(?:what are |show |find )?(?:the )?top (?:(\d+) )?entities",
+     "MATCH (e:Entity) RETURN e.name as name, e.type as type, e.importance_score as score, size(e.papers) as papers ORDER BY e.importance_score DESC LIMIT $limit",
+     "Finding top {limit} entities",
+     TOPN,
+     ('top',)),
+    
+    # "Show all genes/proteins/conditions"
+    (r"(?:show|find|get|list) (?:all )?(gene|protein|tissue|condition|organism|chemical|disease|cell_type|assay)s?$",
+     "MATCH (e:Entity) WHERE e.type = $type RETURN e.name as name, e.type as type, e.importance_score as score, size(e.papers) as papers ORDER BY e.importance_score DESC LIMIT 30",
+     "Finding all {type} entities",
+     TYPE_LIST,
+     ('show', 'find', 'get', 'list')),
+    
+    # "Path between X and Y"
+    (r"(?:path|connection) between (.+) and (.+)",
+     "MATCH path = shortestPath((a:Entity)-[*..4]-(b:Entity)) WHERE toLower(a.name) = toLower($entity1) AND toLower(b.name) = toLower($entity2) WITH path, relationships(path) as rels, nodes(path) as nodes RETURN [n in nodes | n.name] as path_nodes, [r in rels | r.relation_type] as relations, length(path) as path_length LIMIT 5",
+     "Finding path between {entity1} and {entity2}",
+     PATH,
+     ('path', 'connection')),
+    
+    # "Papers about X"
+    (r"(?:papers|studies|research) (?:about|on|for) (.+)",
+     "MATCH (e:Entity) WHERE toLower(e.name) = toLower($entity) RETURN e.name as entity, e.papers as paper_ids, size(e.papers) as paper_count ORDER BY size(e.papers) DESC",
+     "Finding papers about {entity}",
+     ENTITY,
+     ('papers', 'studies', 'research')),
+]
+
+# Compiled once at import and shared by every converter
+def _compile_patterns(raw_patterns):
+    """
+    Compile every pattern case-insensitively, with RE2 when available.
+    
+    Returns:
+        (compiled pattern table, RE2 set matching all patterns at once or None)
+    """
+    if re2 is None:
+        compiled = [
+            (re.compile(pattern, re.IGNORECASE), cypher_template, description, kind)
+            for pattern, cypher_template, description, kind, _ in raw_patterns
+        ]
+        return compiled, None
+    
+    options = re2.Options()
+    options.case_sensitive = False
+    pattern_set = re2.Set.SearchSet(options)
+    compiled = []
+    for pattern, cypher_template, description, kind, _ in raw_patterns:
+        pattern_set.Add(pattern)
+        compiled.append((re2.compile(pattern, options), cypher_template, description, kind))
+    pattern_set.Compile()
+    return compiled, pattern_set
+
+
+_PATTERNS, _PATTERN_SET = _compile_patterns(_RAW_PATTERNS)
+
+
+
+def _build_keyword_index(raw_patterns):
+    """Map each trigger keyword to the indices of the patterns that need it."""
+    keyword_index = {}
+    for i, (*_, keywords) in enumerate(raw_patterns):
+        for keyword in keywords:
+            keyword_index.setdefault(keyword, []).append(i)
+    return keyword_index
+
+
+_KEYWORD_INDEX = _build_keyword_index(_RAW_PATTERNS)
+
+
+def query_templates() -> List[str]:
+    """Return every Cypher template the converter can produce."""
+    return [cypher_template for _, cypher_template, _, _ in _PATTERNS]
 
 
 class NLToCypherConverter:
     """Converts natural language queries to Cypher"""
     
     def __init__(self):
-        # Common query patterns: (regex, cypher_template, description)
-        self.patterns = [
-            # "What affects X?"
-            (r"what (?:affects|impacts|influences) (.+)",
-             "MATCH (n:Entity)-[r:AFFECTS|INCREASES|DECREASES|INDUCES]->(m:Entity) WHERE toLower(m.name) = toLower($entity) RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
-             "Finding what affects {entity}"),
-            
-            # "What is affected by X?"
-            (r"what (?:is )?affected by (.+)",
-             "MATCH (n:Entity)-[r:AFFECTS|INCREASES|DECREASES|INDUCES]->(m:Entity) WHERE toLower(n.name) = toLower($entity) RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
-             "Finding what is affected by {entity}"),
-            
-            # "What causes X?"
-            (r"what causes (.+)",
-             "MATCH (n:Entity)-[r]->(m:Entity) WHERE toLower(m.name) = toLower($entity) AND (r.relation_type = 'causes' OR r.relation_type = 'induces') RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
-             "Finding what causes {entity}"),
-            
-            # "What increases/decreases X?"
-            (r"what (increases|decreases) (.+)",
-             "MATCH (n:Entity)-[r]->(m:Entity) WHERE toLower(m.name) = toLower($entity) AND r.relation_type = $relation RETURN n.name as source, r.relation_type as relation, m.name as target, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 20",
-             "Finding what {relation} {entity}"),
-            
-            # "Show relationships for X"
-            (r"(?:show|find|get) (?:relationships|relations|connections) (?:for|of) (.+)",
-             "MATCH (n:Entity)-[r]-(m:Entity) WHERE toLower(n.name) = toLower($entity) RETURN n.name as entity1, r.relation_type as relation, m.name as entity2, r.evidence_count as evidence, r.confidence as confidence ORDER BY r.evidence_count DESC LIMIT 30",
-             "Finding all relationships for {entity}"),
-            
-            # "Find genes related to X"
-            (r"(?:find|show|get) (gene|protein|tissue|condition|organism|chemical|disease)s? (?:related to|associated with) (.+)",
-             "MATCH (n:Entity)-[r]-(m:Entity) WHERE toLower(m.name) = toLower($entity) AND n.type = $type RETURN n.name as name, n.type as type, r.relation_type as relation, m.name as related_to, r.evidence_count as evidence ORDER BY r.evidence_count DESC LIMIT 20",
-             "Finding {type} related to {entity}"),
-            
-            # "What are the top entities?"
-            (r"(?:what are |show |find )?(?:the )?top (\d+)? ?entities",
-             "MATCH (e:Entity) RETURN e.name as name, e.type as type, e.importance_score as score, size(e.papers) as papers ORDER BY e.importance_score DESC LIMIT $limit",
-             "Finding top {limit} entities"),
-            
-            # "Show all genes/proteins/conditions"
-            (r"(?:show|find|get|list) (?:all )?(gene|protein|tissue|condition|organism|chemical|disease|cell_type|assay)s?$",
-             "MATCH (e:Entity) WHERE e.type = $type RETURN e.name as name, e.type as type, e.importance_score as score, size(e.papers) as papers ORDER BY e.importance_score DESC LIMIT 30",
-             "Finding all {type} entities"),
-            
-            # "Path between X and Y"
-            (r"(?:path|connection) between (.+) and (.+)",
-             "MATCH path = shortestPath((a:Entity)-[*..4]-(b:Entity)) WHERE toLower(a.name) = toLower($entity1) AND toLower(b.name) = toLower($entity2) WITH path, relationships(path) as rels, nodes(path) as nodes RETURN [n in nodes | n.name] as path_nodes, [r in rels | r.relation_type] as relations, length(path) as path_length LIMIT 5",
-             "Finding path between {entity1} and {entity2}"),
-            
-            # "Papers about X"
-            (r"(?:papers|studies|research) (?:about|on|for) (.+)",
-             "MATCH (e:Entity) WHERE toLower(e.name) = toLower($entity) RETURN e.name as entity, e.papers as paper_ids, size(e.papers) as paper_count ORDER BY size(e.papers) DESC",
-             "Finding papers about {entity}"),
-        ]
+        self.patterns = _PATTERNS
+        self.keyword_index = _KEYWORD_INDEX
     
     def convert(self, nl_query: str) -> Tuple[Optional[str], Optional[str], Optional[Dict]]:
         """
@@ -74,72 +175,68 @@ class NLToCypherConverter:
         Returns:
             Tuple of (cypher_query, explanation, parameters) or (None, None, None) if no match
         """
-        nl_query = nl_query.lower().strip()
+        nl_query = nl_query.strip()
         
-        for pattern, cypher_template, description in self.patterns:
-            match = re.search(pattern, nl_query, re.IGNORECASE)
+        for i in self._candidate_patterns(nl_query):
+            pattern, cypher_template, description, kind = self.patterns[i]
+            match = pattern.search(nl_query)
             if match:
-                groups = match.groups()
-                
-                # Build substitution dict for description
-                desc_subs = {}
-                # Build parameters dict for Cypher query
-                params = {}
-                
-                if len(groups) == 1:
-                    # Single entity queries
-                    entity = groups[0].strip().rstrip('?!.,;:')  # Remove trailing punctuation
-                    
-                    # Check if this is a "show all X" type query (captured entity type, not entity name)
-                    if '$type' in cypher_template:
-                        # This is "show all conditions" type query - group is the type
-                        params['type'] = entity
-                        desc_subs['type'] = entity
-                    else:
-                        # Regular entity query
-                        params['entity'] = entity
-                        desc_subs['entity'] = entity
-                    
-                    params['limit'] = 10
-                    
-                    # Handle "top N entities"
-                    if '$limit' in cypher_template and re.search(r"top (\d+)", nl_query):
-                        limit_match = re.search(r"top (\d+)", nl_query)
-                        params['limit'] = int(limit_match.group(1))
-                        desc_subs['limit'] = limit_match.group(1)
-                
-                elif len(groups) == 2:
-                    # Two entity queries (path finding, find genes related to, or increase/decrease)
-                    if '$entity1' in cypher_template:
-                        # Path queries
-                        params['entity1'] = groups[0].strip().rstrip('?!.,;:')
-                        params['entity2'] = groups[1].strip().rstrip('?!.,;:')
-                        desc_subs['entity1'] = groups[0].strip().rstrip('?!.,;:')
-                        desc_subs['entity2'] = groups[1].strip().rstrip('?!.,;:')
-                    elif '$type' in cypher_template:
-                        # "Find genes related to X" queries
-                        params['type'] = groups[0].strip()
-                        params['entity'] = groups[1].strip().rstrip('?!.,;:')
-                        desc_subs['type'] = groups[0].strip()
-                        desc_subs['entity'] = groups[1].strip().rstrip('?!.,;:')
-                    elif '$relation' in cypher_template:
-                        # "What increases/decreases X" queries
-                        params['relation'] = groups[0].strip()
-                        params['entity'] = groups[1].strip().rstrip('?!.,;:')
-                        desc_subs['relation'] = groups[0].strip()
-                        desc_subs['entity'] = groups[1].strip().rstrip('?!.,;:')
-                    else:
-                        params['entity'] = groups[1].strip().rstrip('?!.,;:')
-                        desc_subs['entity'] = groups[1].strip().rstrip('?!.,;:')
-                
-                # Generate query and description
-                cypher_query = cypher_template  # No formatting needed - uses parameters
-                explanation = description.format(**desc_subs)
+                # Parameters double as the description substitutions
+                params = self._extract_params(kind, match.groups())
+                explanation = description.format(**params)
                 
-                return cypher_query, explanation, params
+                # No formatting needed - template uses parameters
+                return cypher_template, explanation, params
         
         return None, None, None
     
+    def _candidate_patterns(self, nl_query: str) -> Iterable[int]:
+        """Indices of patterns that may match the query, in priority order."""
+        if _PATTERN_SET is not None:
+            # Single RE2 scan reports exactly which patterns match
+            return sorted(_PATTERN_SET.Match(nl_query) or ())
+        
+        # Otherwise only try patterns whose trigger keywords occur in the query
+        lowered = nl_query.lower()
+        candidates = set()
+        for keyword, indices in self.keyword_index.items():
+            if keyword in lowered:
+                candidates.update(indices)
+        
+        # Every pattern contains one of its trigger keywords literally, so a
+        # pattern outside the candidates cannot match
+        return sorted(candidates)
+    
+    @staticmethod
+    def _extract_params(kind: str, groups: Tuple) -> Dict:
+        """Map a pattern's captured groups to Cypher parameters based on its kind."""
+        if kind == ENTITY:
+            return {'entity': groups[0].strip().rstrip(_TRAILING_PUNCTUATION)}
+        
+        if kind == RELATION_ENTITY:
+            return {
+                'relation': groups[0].lower(),
+                'entity': groups[1].strip().rstrip(_TRAILING_PUNCTUATION)
+            }
+        
+        if kind == TYPED_ENTITY:
+            return {
+                'type': groups[0].lower(),
+                'entity': groups[1].strip().rstrip(_TRAILING_PUNCTUATION)
+            }
+        
+        if kind == TOPN:
+            return {'limit': int(groups[0]) if groups[0] else DEFAULT_TOP_LIMIT}
+        
+        if kind == TYPE_LIST:
+            return {'type': groups[0].lower()}
+        
+        # PATH
+        return {
+            'entity1': groups[0].strip().rstrip(_TRAILING_PUNCTUATION),
+            'entity2': groups[1].strip().rstrip(_TRAILING_PUNCTUATION)
+        }
+    
     def get_example_queries(self) -> List[str]:
         """Return list of example queries users can try"""
         return [
@@ -153,24 +250,33 @@ class NLToCypherConverter:
         ]
 
 
+def _fetch_data(tx, cypher_query, parameters):
+    """Transaction function: run a query and return its records as dicts."""
+    return tx.run(cypher_query, parameters).data()
+
+
 def execute_cypher_query(cypher_query: str, graph_backend, parameters: Dict = None):
     """
     Execute a Cypher query using the Neo4j driver.
     
     Args:
         cypher_query: Cypher query string with parameterized placeholders
-        graph_backend: GraphPlaceholder instance  
+        graph_backend: Neo4jAdapter instance (provides driver and database)
         parameters: Dictionary of parameters for the query
     
     Returns:
         List of result records as dicts
     """
+    is_read = _WRITE_CLAUSE_RE.search(cypher_query) is None
+    
     try:
-        with graph_backend.driver.session() as session:
-            result = session.run(cypher_query, parameters or {})
-            records = []
-            for record in result:
-                records.append(dict(record))
-            return records
+        from neo4j import READ_ACCESS, WRITE_ACCESS
+        
+        with graph_backend.driver.session(
+            database=graph_backend.database,
+            default_access_mode=READ_ACCESS if is_read else WRITE_ACCESS
+        ) as session:
+            run = session.execute_read if is_read else session.execute_write
+            return run(_fetch_data, cypher_query, parameters or {})
     except Exception as e:
         raise Exception(f"Query execution failed: {str(e)}")
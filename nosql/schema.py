@@ -0,0 +1,14 @@
+# nosql/schema.py
+"""
+Column layout of graph client results, shared by every adapter so list and
+DataFrame results have the same fields in the same order.
+"""
+
+ENTITY_COLUMNS = [
+    'entity_id', 'name', 'type', 'importance_score', 'paper_count', 'relation_count'
+]
+
+RELATION_COLUMNS = [
+    'source', 'source_id', 'relation', 'target', 'target_id',
+    'evidence_count', 'confidence', 'papers'
+]
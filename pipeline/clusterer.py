@@ -1,18 +1,59 @@
 # pipeline/clusterer.py
 """
 Microstep 6:
-Clustering for all embeddings using KMeans.
+Clustering for all embeddings using KMeans
+(FAISS when installed, otherwise scikit-learn MiniBatchKMeans).
 """
 
+import hashlib
+import json
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Papers per mini-batch; small corpora are effectively clustered full-batch
+KMEANS_BATCH_SIZE = 4096
+# Lloyd iterations for the FAISS backend
+FAISS_NITER = 20
+# Candidate cluster counts tried when n_clusters is not given
+DEFAULT_K_RANGE = range(2, 16)
+
+# Incremental label cache written next to the clustering outputs
+CENTROIDS_FILE = "centroids.npy"
+LABELS_FILE = "cluster_labels.csv"
+# Fit details: digest of the cached papers' embedding rows (a mismatch means they
+# were regenerated) and whether centroids live in L2-normalized space
+FIT_FILE = "cluster_fit.json"
+# Re-fit from scratch once this share of papers is new since the last fit
+REFIT_FRACTION = 0.2
+
+def load_embedding_matrix(npy_path):
+    """
+    Load embeddings.npy as a C-contiguous float32 matrix.
+    The file is memory-mapped: float32 files are used in place (read-only),
+    other dtypes are converted in a single streamed pass.
+    """
+    raw = np.load(npy_path, mmap_mode="r")
+    if raw.dtype == np.float32 and raw.flags.c_contiguous:
+        return raw
+
+    embeddings = np.empty(raw.shape, dtype=np.float32)
+    np.copyto(embeddings, raw, casting="same_kind")
+    return embeddings
+
 
 def load_embeddings(npy_path, meta_path):
     """
-    Load embeddings.npy and embeddings_meta.csv
+    Load embeddings.npy (as C-contiguous float32) and embeddings_meta.csv
     """
-    embeddings = np.load(npy_path)
+    embeddings = load_embedding_matrix(npy_path)
     meta = pd.read_csv(meta_path)
     return embeddings, meta
 
@@ -20,22 +61,279 @@ def load_embeddings(npy_path, meta_path):
 def run_kmeans(embeddings, n_clusters=5):
     """
     Apply KMeans clustering.
+    Uses faiss.Kmeans (BLAS distance computation, GPU if available) when faiss
+    is installed, otherwise scikit-learn MiniBatchKMeans.
     """
-    print(f"[Clusterer] Running KMeans with n_clusters={n_clusters}")
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    if faiss is not None:
+        print(f"[Clusterer] Running FAISS KMeans with n_clusters={n_clusters}")
+        kmeans = faiss.Kmeans(
+            d=embeddings.shape[1],
+            k=n_clusters,
+            niter=FAISS_NITER,
+            seed=42,
+            verbose=False,
+            gpu=faiss.get_num_gpus() > 0
+        )
+        kmeans.train(embeddings)
+        _, labels = kmeans.index.search(embeddings, 1)
+        return labels.ravel().astype(np.int32)
+
+    print(f"[Clusterer] Running MiniBatchKMeans with n_clusters={n_clusters}")
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        batch_size=KMEANS_BATCH_SIZE,
+        n_init="auto",
+        max_iter=100,
+        random_state=42
+    )
     labels = kmeans.fit_predict(embeddings)
-    return labels
+    return labels.astype(np.int32, copy=False)
+
+
+def _assign_to_centroids(embeddings, centroids):
+    """
+    Label each row with its nearest centroid (squared Euclidean, one GEMM).
+    """
+    distances = (
+        -2.0 * embeddings @ centroids.T
+        + np.einsum("ij,ij->i", centroids, centroids)
+    )
+    return distances.argmin(axis=1)
 
 
-def generate_clusters(embeddings_path, meta_path, n_clusters=5):
+def _split_largest_cluster(embeddings, centroids, labels):
+    """
+    Add one centroid by seeding it at the member of the largest cluster that is
+    farthest from that cluster's centroid.
+    """
+    largest = np.bincount(labels, minlength=len(centroids)).argmax()
+    members = embeddings[labels == largest]
+    offsets = members - centroids[largest]
+    farthest = members[np.einsum("ij,ij->i", offsets, offsets).argmax()]
+    return np.vstack([centroids, farthest])
+
+
+def _l2_normalize(embeddings):
+    """Row-wise L2-normalized float32 copy of embeddings."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True).clip(min=1e-12)
+    return np.ascontiguousarray(embeddings / norms)
+
+
+def sweep_kmeans(embeddings, ks=DEFAULT_K_RANGE):
+    """
+    Run MiniBatchKMeans for each k in ks on L2-normalized embeddings.
+    Only the smallest k uses k-means++ init; each larger k is warm-started from
+    the previous centroids with the largest clusters split.
+
+    Returns:
+        dict {k: (labels, inertia, centroids)}, centroids in normalized space
+    """
+    embeddings = _l2_normalize(embeddings)
+
+    results = {}
+    centroids = None
+    labels = None
+    for k in sorted(ks):
+        if centroids is None:
+            init, n_init = "k-means++", "auto"
+        else:
+            init = centroids
+            while len(init) < k:
+                init = _split_largest_cluster(embeddings, init, labels)
+                labels = _assign_to_centroids(embeddings, init)
+            n_init = 1
+
+        print(f"[Clusterer] Sweep: MiniBatchKMeans with n_clusters={k}")
+        kmeans = MiniBatchKMeans(
+            n_clusters=k,
+            init=init,
+            n_init=n_init,
+            batch_size=KMEANS_BATCH_SIZE,
+            max_iter=100,
+            random_state=42
+        )
+        labels = kmeans.fit_predict(embeddings)
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        results[k] = (labels.astype(np.int32, copy=False), float(kmeans.inertia_), centroids)
+
+    return results
+
+
+def pick_knee(inertias):
+    """
+    Pick k at the knee of the inertia curve: the point farthest below the
+    straight line joining the first and last (normalized) points.
+
+    Args:
+        inertias: dict {k: inertia}
+    """
+    ks = np.array(sorted(inertias), dtype=np.float64)
+    values = np.array([inertias[k] for k in ks.astype(int)], dtype=np.float64)
+    if len(ks) < 3:
+        return int(ks[0])
+
+    x = (ks - ks[0]) / (ks[-1] - ks[0])
+    span = values[0] - values[-1]
+    y = (values - values[-1]) / span if span > 0 else np.zeros_like(values)
+    # Line runs from (0, 1) to (1, 0); distance below it is 1 - x - y
+    return int(ks[np.argmax(1.0 - x - y)])
+
+
+def _centroids_from_labels(embeddings, labels, n_clusters):
+    """
+    Mean embedding of each cluster (in the original, unnormalized space).
+    """
+    sums = np.zeros((n_clusters, embeddings.shape[1]), dtype=np.float64)
+    np.add.at(sums, labels, embeddings)
+    counts = np.bincount(labels, minlength=n_clusters).clip(min=1)
+    return (sums / counts[:, None]).astype(np.float32)
+
+
+def _paper_rows(meta):
+    """
+    paper_id -> row position in meta; a paper listed twice maps to its last row.
+    """
+    rows = pd.Series(np.arange(len(meta)), index=meta["paper_id"])
+    return rows[~rows.index.duplicated(keep="last")]
+
+
+def _embeddings_digest(embeddings, rows):
+    """
+    Hash the given embedding rows (in order), streaming a chunk at a time.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for start in range(0, len(rows), KMEANS_BATCH_SIZE):
+        chunk = embeddings[rows[start:start + KMEANS_BATCH_SIZE]]
+        digest.update(np.ascontiguousarray(chunk, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def _load_cluster_cache(cache_dir, n_clusters, embeddings, meta):
+    """
+    Load cached centroids and labels from cache_dir.
+    Returns (centroids, labels DataFrame indexed by paper_id with cluster_id and
+    fitted columns, whether the centroids are in normalized space) or None if
+    missing, fit with another k, or if the embeddings of the cached papers have
+    changed since.
+    """
+    cache_dir = Path(cache_dir)
+    centroids_path = cache_dir / CENTROIDS_FILE
+    labels_path = cache_dir / LABELS_FILE
+    fit_path = cache_dir / FIT_FILE
+    if not (centroids_path.exists() and labels_path.exists() and fit_path.exists()):
+        return None
+    fit = json.loads(fit_path.read_text())
+
+    centroids = np.load(centroids_path)
+    if n_clusters is not None and len(centroids) != n_clusters:
+        return None
+    if centroids.shape[1] != embeddings.shape[1]:
+        return None
+
+    cached = pd.read_csv(labels_path).drop_duplicates("paper_id", keep="last")
+    if "fitted" not in cached.columns:
+        return None
+
+    # Every cached paper must still be present with the same embedding
+    rows = cached["paper_id"].map(_paper_rows(meta))
+    if rows.isna().any():
+        return None
+    digest = _embeddings_digest(embeddings, rows.to_numpy(dtype=np.int64))
+    if digest != fit["digest"]:
+        print("[Clusterer] Embeddings changed since the cached fit; re-fitting")
+        return None
+
+    return centroids, cached.set_index("paper_id")[["cluster_id", "fitted"]], fit["normalized"]
+
+
+def _save_cluster_cache(cache_dir, centroids, clusters_df, fitted, embeddings, normalized):
+    """
+    Write labels (and centroids, when re-fit) to cache_dir, with a digest of
+    the labelled papers' embeddings.
+
+    Args:
+        fitted: Boolean per row, True for papers that were part of the last fit
+            (False for papers only assigned to the cached centroids since)
+        normalized: Whether the fit (and the centroids) used L2-normalized embeddings
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if centroids is not None:
+        np.save(cache_dir / CENTROIDS_FILE, centroids)
+    clusters_df.assign(fitted=fitted).to_csv(cache_dir / LABELS_FILE, index=False)
+
+    # clusters_df rows line up with the embedding rows; hash the same rows,
+    # in the same order, that _load_cluster_cache will look up
+    rows = np.flatnonzero(~clusters_df["paper_id"].duplicated(keep="last").to_numpy())
+    fit = {"digest": _embeddings_digest(embeddings, rows), "normalized": bool(normalized)}
+    (cache_dir / FIT_FILE).write_text(json.dumps(fit))
+
+
+def generate_clusters(embeddings_path, meta_path, n_clusters=5, cache_dir=None):
     """
     Full clustering pipeline:
     - load embeddings
-    - run clustering
+    - run clustering (n_clusters=None sweeps DEFAULT_K_RANGE and picks the knee)
     - produce dataframe: paper_id, cluster_id
+
+    With cache_dir, centroids and labels from the previous fit are reused:
+    papers already labelled keep their cluster and only new papers are assigned
+    to the nearest cached centroid, until more than REFIT_FRACTION of the papers
+    were not part of the last fit.
     """
-    embeddings, meta = load_embeddings(embeddings_path, meta_path)
-    labels = run_kmeans(embeddings, n_clusters=n_clusters)
+    embeddings = load_embedding_matrix(embeddings_path)
+
+    cache = None
+    if cache_dir:
+        meta = pd.read_csv(meta_path, usecols=["paper_id"])
+        cache = _load_cluster_cache(cache_dir, n_clusters, embeddings, meta)
+    if cache is not None:
+        centroids, cached, normalized = cache
+        known = meta["paper_id"].map(cached["cluster_id"])
+        fitted = meta["paper_id"].map(cached["fitted"]).eq(True).to_numpy()
+        new_rows = known.isna().to_numpy()
+
+        # Papers assigned on earlier runs count too: growth is measured since the fit
+        unique = ~meta["paper_id"].duplicated(keep="last").to_numpy()
+        since_fit = int((~fitted[unique]).sum())
+        if since_fit <= REFIT_FRACTION * unique.sum():
+            print(
+                f"[Clusterer] Reusing cached clusters; assigning {new_rows.sum()} new papers "
+                f"({since_fit} since the last fit)"
+            )
+            labels = known.fillna(-1).to_numpy(dtype=np.int32)
+            if new_rows.any():
+                # Assign in the same space the centroids were fit in
+                new_embeddings = embeddings[new_rows]
+                if normalized:
+                    new_embeddings = _l2_normalize(new_embeddings)
+                labels[new_rows] = _assign_to_centroids(new_embeddings, centroids)
+            meta["cluster_id"] = labels
+            clusters = meta[["paper_id", "cluster_id"]]
+            _save_cluster_cache(cache_dir, None, clusters, fitted, embeddings, normalized)
+            return clusters
+
+    if n_clusters is None:
+        sweep = sweep_kmeans(embeddings)
+        n_clusters = pick_knee({k: inertia for k, (_, inertia, _) in sweep.items()})
+        print(f"[Clusterer] Knee of inertia curve at n_clusters={n_clusters}")
+        labels, _, centroids = sweep[n_clusters]
+        normalized = True
+    else:
+        labels = run_kmeans(embeddings, n_clusters=n_clusters)
+        normalized = False
+        if cache_dir:
+            centroids = _centroids_from_labels(embeddings, labels, n_clusters)
+    if not cache_dir:
+        del embeddings
 
+    # Metadata is only needed to attach labels, so read it after clustering
+    meta = pd.read_csv(meta_path, usecols=["paper_id"])
     meta["cluster_id"] = labels
-    return meta[["paper_id", "cluster_id"]]
+    clusters = meta[["paper_id", "cluster_id"]]
+    if cache_dir:
+        _save_cluster_cache(cache_dir, centroids, clusters, True, embeddings, normalized)
+    return clusters
@@ -7,6 +7,7 @@ keywords, and cluster summaries.
 
 import pandas as pd
 import json
+import re
 from pathlib import Path
 
 def find_top_keywords(df_keywords, top_n=5):
@@ -22,28 +23,37 @@ def find_top_keywords(df_keywords, top_n=5):
     return result
 
 
+GAP_TERMS = [
+    "unknown", "unclear", "lack", "limited", "future work",
+    "further studies", "not understood", "requires validation"
+]
+
+# One alternation scanned once per summary instead of one substring test per term
+_GAP_PATTERN = re.compile("|".join(map(re.escape, GAP_TERMS)))
+_GAP_RANK = {term: i for i, term in enumerate(GAP_TERMS)}
+
+
 def identify_knowledge_gaps(cluster_summaries):
     """
     Heuristic-based simple gap detector:
     searches for common scientific gap indicators.
     """
-    gaps = []
-
-    gap_terms = [
-        "unknown", "unclear", "lack", "limited", "future work",
-        "further studies", "not understood", "requires validation"
-    ]
-
-    for _, row in cluster_summaries.iterrows():
-        text = row["cluster_summary"].lower()
-        for term in gap_terms:
-            if term in text:
-                gaps.append({
-                    "cluster_id": row["cluster_id"],
-                    "gap_term": term,
-                    "sentence": text
-                })
-    
+    lowered = cluster_summaries["cluster_summary"].str.lower().reset_index(drop=True)
+
+    found = pd.DataFrame({
+        "cluster_id": cluster_summaries["cluster_id"].reset_index(drop=True),
+        "gap_term": lowered.str.findall(_GAP_PATTERN),
+        "sentence": lowered
+    }).explode("gap_term").dropna(subset=["gap_term"])
+
+    # Each term once per cluster, listed in GAP_TERMS order
+    found = (
+        found.assign(row=found.index, rank=found["gap_term"].map(_GAP_RANK))
+        .drop_duplicates(["row", "gap_term"])
+        .sort_values(["row", "rank"], kind="stable")
+    )
+
+    gaps = found[["cluster_id", "gap_term", "sentence"]].to_dict(orient="records")
     return gaps
 
 
@@ -5,9 +5,18 @@ Extract keywords from each paper summary, link to clusters,
 and save cluster_keywords.csv.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
 import pandas as pd
 import yake
 
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # ships with scikit-learn; without it only the env vars apply
+    threadpool_limits = None
+
 # YAKE configuration (can tune later)
 kw_extractor = yake.KeywordExtractor(
     lan="en",
@@ -16,6 +25,11 @@ kw_extractor = yake.KeywordExtractor(
     top=10
 )
 
+# Summaries handed to each worker process at a time
+KEYWORD_CHUNKSIZE = 32
+# Native thread-pool sizes read when OpenMP/BLAS first load
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
 def extract_keywords_from_text(text):
     """
     Extracts keywords from one summary.
@@ -27,39 +41,94 @@ def extract_keywords_from_text(text):
         return []
 
 
-def build_cluster_keywords(summaries_df, clusters_df):
+def _merge_on_paper_id(summaries_df, clusters_df):
     """
-    Combine summaries.csv + clusters.csv
-    For each summary:
-        extract keywords
-        attach cluster_id
+    Inner-join summaries with cluster assignments on paper_id.
+    Both keys share one categorical dtype, so pandas joins on integer codes
+    instead of hashing strings; cluster_id becomes categorical as well.
+    """
+    paper_ids = pd.CategoricalDtype(
+        pd.concat([summaries_df["paper_id"], clusters_df["paper_id"]]).unique()
+    )
+    return summaries_df.astype({"paper_id": paper_ids}).merge(
+        clusters_df.astype({"paper_id": paper_ids, "cluster_id": "category"}),
+        on="paper_id",
+        how="inner"
+    )
+
+
+@contextmanager
+def _single_threaded_env():
+    """
+    Set the thread-pool env vars to 1 while the pool runs, so workers started
+    fresh (spawn/forkserver) load BLAS/OpenMP single-threaded.
     """
-    merged = summaries_df.merge(clusters_df, on="paper_id", how="inner")
+    saved = {var: os.environ.get(var) for var in _THREAD_ENV_VARS}
+    os.environ.update({var: "1" for var in _THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
 
-    rows = []
 
-    for _, row in merged.iterrows():
-        summary = row["summary"]
-        paper_id = row["paper_id"]
-        cluster_id = row["cluster_id"]
+def _init_worker():
+    """
+    Limit thread pools that are already loaded to one thread: forked workers
+    inherit the parent's BLAS/OpenMP state, where the env vars are too late.
+    """
+    if threadpool_limits is not None:
+        threadpool_limits(limits=1)
 
-        # get top 10 keywords for this summary
-        kw_list = extract_keywords_from_text(summary)
 
-        for kw, score in kw_list:
-            rows.append({
-                "paper_id": paper_id,
-                "cluster_id": cluster_id,
-                "keyword": kw,
-                "score": score
-            })
+def build_cluster_keywords(summaries_df, clusters_df, n_workers=None):
+    """
+    Combine summaries.csv + clusters.csv
+    For each summary:
+        extract keywords
+        attach cluster_id
 
-    df_keywords = pd.DataFrame(rows)
+    YAKE is pure Python and CPU-bound, so summaries are spread over a
+    process pool (n_workers defaults to the CPU count; 1 runs inline).
+    """
+    merged = _merge_on_paper_id(summaries_df, clusters_df)
+
+    # Duplicate rows in either CSV multiply through the merge; extract each paper once,
+    # from its last summary (the one db_init stores)
+    docs = merged.drop_duplicates(subset=["paper_id"], keep="last")[["paper_id", "summary"]]
+    summaries = docs["summary"].tolist()
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers > 1 and len(summaries) > 1:
+        with _single_threaded_env(), \
+                ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker) as ex:
+            kw_lists = list(ex.map(extract_keywords_from_text, summaries, chunksize=KEYWORD_CHUNKSIZE))
+    else:
+        kw_lists = [extract_keywords_from_text(summary) for summary in summaries]
+
+    # top 10 (keyword, score) pairs per paper, one row each
+    kws = (
+        docs[["paper_id"]].assign(kws=kw_lists)
+        .explode("kws")
+        .dropna(subset=["kws"])
+        .reset_index(drop=True)
+    )
+    kws[["keyword", "score"]] = pd.DataFrame(kws.pop("kws").tolist(), columns=["keyword", "score"])
+
+    # attach cluster_id
+    df_keywords = (
+        merged[["paper_id", "cluster_id"]]
+        .drop_duplicates()
+        .merge(kws, on="paper_id", how="inner")
+        .reset_index(drop=True)
+        .astype({"paper_id": summaries_df["paper_id"].dtype, "cluster_id": clusters_df["cluster_id"].dtype})
+    )
     return df_keywords
 
 
-from pipeline.summarizer import summarize_text
-
 def generate_cluster_summaries(summaries_df, clusters_df):
     """
     For each cluster_id:
@@ -68,25 +137,29 @@ def generate_cluster_summaries(summaries_df, clusters_df):
         run summarizer
         save cluster-level summary
     """
-    merged = summaries_df.merge(clusters_df, on="paper_id", how="inner")
-
-    cluster_ids = sorted(merged["cluster_id"].unique())
-    rows = []
-
-    for cid in cluster_ids:
-        df_cluster = merged[merged["cluster_id"] == cid]
-
-        # Combine summaries (limit text length if needed)
-        big_text = " ".join(df_cluster["summary"].tolist())[:5000]
-
+    # Imported here so keyword extraction (and its worker processes) never import torch
+    from pipeline.summarizer import summarize_batch, SUMMARY_BATCH_SIZE
+
+    merged = _merge_on_paper_id(summaries_df, clusters_df)
+
+    # Combine summaries per cluster in one pass (limit text length if needed)
+    blobs = (
+        merged.groupby("cluster_id", sort=True, observed=True)["summary"]
+        .agg(lambda s: " ".join(s.tolist())[:5000])
+        .reset_index()
+        .astype({"cluster_id": clusters_df["cluster_id"].dtype})
+    )
+    texts = blobs["summary"].tolist()
+
+    cluster_summaries = []
+    for start in range(0, len(texts), SUMMARY_BATCH_SIZE):
+        batch = texts[start:start + SUMMARY_BATCH_SIZE]
         try:
-            cluster_summary = summarize_text(big_text, max_len=180)
+            cluster_summaries.extend(summarize_batch(batch, max_len=180))
         except:
-            cluster_summary = "Summary generation failed."
-
-        rows.append({
-            "cluster_id": cid,
-            "cluster_summary": cluster_summary
-        })
+            cluster_summaries.extend(["Summary generation failed."] * len(batch))
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame({
+        "cluster_id": blobs["cluster_id"],
+        "cluster_summary": cluster_summaries
+    })
@@ -2,6 +2,7 @@
 """
 Microstep 11:
 Create SQLite database and load all AI outputs into SQL tables.
+The load_* functions only stage rows; main() commits them in one transaction.
 """
 
 import sys
@@ -11,10 +12,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert, select
 from sqlalchemy.orm import sessionmaker
 
-from sql.models import Base, Paper, Summary, Cluster, Keyword
+from sql.models import Base, Paper, Summary, Cluster, Keyword, paper_cluster, paper_keyword
 
 # Paths
 ROOT = Path(__file__).resolve().parents[1]   # dbs/
@@ -31,91 +32,124 @@ CLUSTER_SUMMARIES_CSV = OUTPUTS / "cluster_summaries.csv"
 # DB file path
 DB_PATH = ROOT / "sql" / "space_bio.db"
 
+# Bulk-load settings: WAL journal, fsync only at checkpoints, ~200 MB page cache.
+# WAL is persistent in the file, so main() switches back to a rollback journal
+# once loading is done
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -200000,
+}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _records(df):
+    """Convert a DataFrame to insert parameter dicts, mapping NaN to NULL."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def paper_id_map(session):
+    """Return {external_id: papers.id} for every paper, read in one SELECT."""
+    return dict(session.execute(select(Paper.external_id, Paper.id)).all())
+
 
 def load_papers(session):
+    """
+    Insert papers not yet in the table.
+
+    Returns:
+        Dict mapping external_id -> papers.id for all papers, for the other loaders
+    """
     df = pd.read_csv(PAPERS_CSV)
 
-    for _, row in df.iterrows():
-        # Check if paper already exists
-        existing = session.query(Paper).filter_by(external_id=row["paper_id"]).first()
-        if existing:
-            continue
-            
-        p = Paper(
-            external_id=row["paper_id"],
-            title=row.get("title"),
-            authors=row.get("authors"),
-            year=row.get("year"),
-            journal=row.get("journal"),
-            doi_url=row.get("doi_url"),
-            abstract=row.get("abstract")
-        )
-        session.add(p)
-    session.commit()
+    # Skip papers that already exist (or repeat within the CSV)
+    id_map = paper_id_map(session)
+    df = df.drop_duplicates("paper_id")
+    df = df[~df["paper_id"].isin(id_map.keys())]
+
+    columns = ["title", "authors", "year", "journal", "doi_url", "abstract"]
+    records = df.reindex(columns=["paper_id"] + columns).rename(columns={"paper_id": "external_id"})
 
+    if not records.empty:
+        id_map.update(session.execute(
+            insert(Paper).returning(Paper.external_id, Paper.id), _records(records)
+        ).all())
+    return id_map
 
-def load_summaries(session):
+
+def load_summaries(session, id_map=None):
     df = pd.read_csv(SUMMARIES_CSV)
 
-    for _, row in df.iterrows():
-        paper = session.query(Paper).filter_by(external_id=row["paper_id"]).first()
-        if not paper:
-            continue
-
-        s = Summary(
-            text=row["summary"],
-            method=row["summary_model"],
-            paper=paper
-        )
-        session.add(s)
-    session.commit()
+    if id_map is None:
+        id_map = paper_id_map(session)
+    df = df.assign(paper_id=df["paper_id"].map(id_map)).dropna(subset=["paper_id"])
+    # One summary per paper: a later row replaces an earlier one
+    df = df.drop_duplicates("paper_id", keep="last")
+
+    records = df[["summary", "summary_model", "paper_id"]].rename(
+        columns={"summary": "text", "summary_model": "method"}
+    )
 
+    if not records.empty:
+        session.execute(insert(Summary), _records(records))
 
-def load_clusters(session):
+
+def load_clusters(session, id_map=None):
     df_clusters = pd.read_csv(CLUSTERS_CSV)
     df_cluster_summaries = pd.read_csv(CLUSTER_SUMMARIES_CSV)
 
     # Create Cluster rows
-    for _, row in df_cluster_summaries.iterrows():
-        c = Cluster(
-            label=str(row["cluster_id"]),
-            summary_text=row["cluster_summary"],
-            representative_keyword=None
-        )
-        session.add(c)
-    session.commit()
+    clusters = pd.DataFrame({
+        "label": df_cluster_summaries["cluster_id"].astype(str),
+        "summary_text": df_cluster_summaries["cluster_summary"],
+        "representative_keyword": None
+    })
+    if not clusters.empty:
+        session.execute(insert(Cluster), _records(clusters))
 
     # Link papers to clusters
-    for _, row in df_clusters.iterrows():
-        paper = session.query(Paper).filter_by(external_id=row["paper_id"]).first()
-        cluster = session.query(Cluster).filter_by(label=str(row["cluster_id"])).first()
+    if id_map is None:
+        id_map = paper_id_map(session)
+    cluster_ids = dict(session.execute(select(Cluster.label, Cluster.id)).all())
 
-        if paper and cluster:
-            # Check if relationship already exists
-            if cluster not in paper.clusters:
-                paper.clusters.append(cluster)
+    links = pd.DataFrame({
+        "paper_id": df_clusters["paper_id"].map(id_map),
+        "cluster_id": df_clusters["cluster_id"].astype(str).map(cluster_ids)
+    }).dropna().drop_duplicates().astype(int)
 
-    session.commit()
+    if not links.empty:
+        session.execute(paper_cluster.insert(), links.to_dict(orient="records"))
 
 
-def load_keywords(session):
+def load_keywords(session, id_map=None):
     df = pd.read_csv(KEYWORDS_CSV)
 
-    for _, row in df.iterrows():
-        # create keyword
-        k = Keyword(
-            text=row["keyword"],
-            score=row["score"]
-        )
-        session.add(k)
-        session.commit()
+    # create keywords, getting their ids back in input order
+    keywords = df[["keyword", "score"]].rename(columns={"keyword": "text"})
+    if keywords.empty:
+        return
+    keyword_ids = session.scalars(
+        insert(Keyword).returning(Keyword.id, sort_by_parameter_order=True),
+        _records(keywords)
+    ).all()
 
-        # link to paper
-        paper = session.query(Paper).filter_by(external_id=row["paper_id"]).first()
-        if paper:
-            paper.keywords.append(k)
+    # link to papers
+    if id_map is None:
+        id_map = paper_id_map(session)
+    links = pd.DataFrame({
+        "paper_id": df["paper_id"].map(id_map),
+        "keyword_id": keyword_ids
+    }).dropna().astype(int)
 
-    session.commit()
+    if not links.empty:
+        session.execute(paper_keyword.insert(), links.to_dict(orient="records"))
 
 
 def main():
@@ -125,24 +159,37 @@ def main():
     if DB_PATH.exists():
         print(f"Removing existing database: {DB_PATH}")
         DB_PATH.unlink()
+    for suffix in ("-wal", "-shm"):
+        DB_PATH.with_name(DB_PATH.name + suffix).unlink(missing_ok=True)
 
     engine = create_engine(f"sqlite:///{DB_PATH}")
+    event.listen(engine, "connect", _set_sqlite_pragmas)
     Base.metadata.create_all(engine)
 
     Session = sessionmaker(bind=engine)
     session = Session()
 
     print("Loading papers...")
-    load_papers(session)
+    id_map = load_papers(session)
 
     print("Loading summaries...")
-    load_summaries(session)
+    load_summaries(session, id_map)
 
     print("Loading clusters...")
-    load_clusters(session)
+    load_clusters(session, id_map)
 
     print("Loading keywords...")
-    load_keywords(session)
+    load_keywords(session, id_map)
+
+    # All tables land in a single transaction
+    session.commit()
+    session.close()
+
+    # Checkpoint the WAL and store the file in rollback-journal mode, so readers
+    # (dashboard, test_db.py) don't leave -wal/-shm files next to it
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+    engine.dispose()
 
     print("\nDatabase created successfully at:")
     print(DB_PATH)
@@ -26,7 +26,8 @@ paper_cluster = Table(
     "paper_cluster",
     Base.metadata,
     Column("paper_id", Integer, ForeignKey("papers.id"), primary_key=True),
-    Column("cluster_id", Integer, ForeignKey("clusters.id"), primary_key=True)
+    # Indexed on its own too, for cluster -> papers lookups (the PK leads with paper_id)
+    Column("cluster_id", Integer, ForeignKey("clusters.id"), primary_key=True, index=True)
 )
 
 # ------------------------
@@ -11,7 +11,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import selectinload, sessionmaker
 from sql.models import Paper, Summary, Keyword, Cluster
 
 DB_PATH = Path(__file__).resolve().parent / "space_bio.db"
@@ -41,7 +41,8 @@ def main():
 
     # 5. Print 3 papers with their clusters
     print("\nSample papers with clusters:")
-    papers = session.query(Paper).limit(3).all()
+    # Clusters for all sampled papers come back in one IN (...) query
+    papers = session.query(Paper).options(selectinload(Paper.clusters)).limit(3).all()
     for p in papers:
         print(f"- {p.external_id}: {[c.label for c in p.clusters]}")
 